@@ -5,17 +5,22 @@ Creates realistic sample data for 3 databases without needing Kaggle dataset.
 """
 
 import pandas as pd
-import random
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from faker import Faker
 import numpy as np
 
 fake = Faker(['id_ID'])  # Indonesian locale
-random.seed(42)
-np.random.seed(42)
+rng = np.random.default_rng(42)  # PCG64 — faster than the legacy global MT19937
 
 print("🏭 Generating sample e-commerce data...\n")
 
+
+def make_ids(prefix, suffixes):
+    """Vectorized '<prefix><zero-padded id>' column from pre-padded suffixes."""
+    return np.char.add(prefix, suffixes)
+
+
 # ============================================================================
 # DATABASE 1: SALES_DB
 # ============================================================================
@@ -24,62 +29,64 @@ print("📊 Generating sales_db data...")
 
 # 1. CUSTOMERS (100 customers)
 print("  - customers table...")
-customers_data = []
-for i in range(1, 101):
-    customers_data.append({
-        'customer_id': f'CUST{i:04d}',
-        'customer_unique_id': f'UUID{i:04d}',
-        'customer_name': fake.name(),
-        'customer_email': fake.email(),
-        'customer_city': random.choice(['Jakarta', 'Bandung', 'Surabaya', 'Medan', 'Semarang']),
-        'customer_state': random.choice(['DKI Jakarta', 'Jawa Barat', 'Jawa Timur', 'Sumatera Utara', 'Jawa Tengah']),
-        'customer_zip_code': fake.postcode(),
-        'customer_created_at': fake.date_between(start_date='-2y', end_date='-1y')
-    })
-
-customers_df = pd.DataFrame(customers_data)
+customer_suffixes = np.char.zfill(np.arange(1, 101).astype(str), 4)
+customer_cities = np.array(['Jakarta', 'Bandung', 'Surabaya', 'Medan', 'Semarang'])
+customer_states = np.array(['DKI Jakarta', 'Jawa Barat', 'Jawa Timur', 'Sumatera Utara', 'Jawa Tengah'])
+
+# fake.postcode() dominates the Faker cost — sample a pool once and draw from it
+postcode_pool = np.array([fake.postcode() for _ in range(200)])
+
+customers_df = pd.DataFrame({
+    'customer_id': make_ids('CUST', customer_suffixes),
+    'customer_unique_id': make_ids('UUID', customer_suffixes),
+    'customer_name': [fake.name() for _ in range(100)],
+    'customer_email': [fake.email() for _ in range(100)],
+    'customer_city': customer_cities[rng.integers(0, len(customer_cities), size=100)],
+    'customer_state': customer_states[rng.integers(0, len(customer_states), size=100)],
+    'customer_zip_code': rng.choice(postcode_pool, size=100),
+    'customer_created_at': [fake.date_between(start_date='-2y', end_date='-1y') for _ in range(100)]
+})
 print(f"    ✓ {len(customers_df)} customers generated")
 
 # 2. ORDERS (500 orders - avg 5 orders per customer)
 print("  - orders table...")
-orders_data = []
-order_id = 1
-
-for _ in range(500):
-    customer = random.choice(customers_data)
-    order_date = fake.date_time_between(start_date='-6m', end_date='now')
-    
-    orders_data.append({
-        'order_id': f'ORD{order_id:06d}',
-        'customer_id': customer['customer_id'],
-        'order_status': random.choice(['delivered', 'delivered', 'delivered', 'shipped', 'processing']),
-        'order_purchase_timestamp': order_date,
-        'order_approved_at': order_date + timedelta(hours=random.randint(1, 24)),
-        'order_delivered_timestamp': order_date + timedelta(days=random.randint(3, 14)) if random.random() > 0.1 else None,
-        'order_estimated_delivery_date': order_date + timedelta(days=random.randint(7, 21))
-    })
-    order_id += 1
-
-orders_df = pd.DataFrame(orders_data)
+customer_id_pool = customers_df['customer_id'].to_numpy()
+order_statuses = np.array(['delivered', 'shipped', 'processing'])
+order_suffixes = np.char.zfill(np.arange(1, 501).astype(str), 6)
+order_ids = make_ids('ORD', order_suffixes)
+
+# Purchase times drawn uniformly over the last 6 months, offsets added as
+# single vector operations instead of 500 timedelta() constructions
+end_ts = pd.Timestamp.now()
+start_ts = end_ts - pd.DateOffset(months=6)
+order_dates = pd.to_datetime(rng.integers(start_ts.value, end_ts.value, size=500))
+
+order_delivered = order_dates + pd.to_timedelta(rng.integers(3, 15, size=500), unit='D')
+order_delivered = pd.Series(order_delivered)
+order_delivered[rng.random(500) < 0.1] = pd.NaT
+
+orders_df = pd.DataFrame({
+    'order_id': order_ids,
+    'customer_id': rng.choice(customer_id_pool, size=500),
+    'order_status': rng.choice(order_statuses, size=500, p=[0.6, 0.2, 0.2]),
+    'order_purchase_timestamp': order_dates,
+    'order_approved_at': order_dates + pd.to_timedelta(rng.integers(1, 25, size=500), unit='h'),
+    'order_delivered_timestamp': order_delivered,
+    'order_estimated_delivery_date': order_dates + pd.to_timedelta(rng.integers(7, 22, size=500), unit='D')
+})
 print(f"    ✓ {len(orders_df)} orders generated")
 
 # 3. PAYMENTS (1 payment per order)
 print("  - payments table...")
-payments_data = []
-
-for order in orders_data:
-    payment_value = round(random.uniform(50000, 5000000), 2)  # Rp 50K - 5M
-    
-    payments_data.append({
-        'payment_id': f'PAY{order["order_id"][3:]}',
-        'order_id': order['order_id'],
-        'payment_sequential': 1,
-        'payment_type': random.choice(['credit_card', 'credit_card', 'boleto', 'debit_card', 'voucher']),
-        'payment_installments': random.choice([1, 1, 1, 3, 6, 12]),
-        'payment_value': payment_value
-    })
-
-payments_df = pd.DataFrame(payments_data)
+payment_types = np.array(['credit_card', 'boleto', 'debit_card', 'voucher'])
+payments_df = pd.DataFrame({
+    'payment_id': make_ids('PAY', order_suffixes),
+    'order_id': order_ids,
+    'payment_sequential': 1,
+    'payment_type': rng.choice(payment_types, size=500, p=[0.4, 0.2, 0.2, 0.2]),
+    'payment_installments': rng.choice([1, 3, 6, 12], size=500, p=[0.5, 1 / 6, 1 / 6, 1 / 6]),
+    'payment_value': np.round(rng.uniform(50000, 5000000, size=500), 2)  # Rp 50K - 5M
+})
 print(f"    ✓ {len(payments_df)} payments generated")
 
 # ============================================================================
@@ -90,61 +97,49 @@ print("\n📦 Generating products_db data...")
 
 # 4. PRODUCTS (50 products)
 print("  - products table...")
-categories = ['Electronics', 'Fashion', 'Home & Living', 'Beauty', 'Sports', 'Books', 'Toys']
-products_data = []
-
-for i in range(1, 51):
-    category = random.choice(categories)
-    products_data.append({
-        'product_id': f'PROD{i:04d}',
-        'product_category_name': category,
-        'product_name_length': random.randint(20, 80),
-        'product_description_length': random.randint(100, 500),
-        'product_photos_qty': random.randint(1, 5),
-        'product_weight_g': random.randint(100, 5000),
-        'product_length_cm': random.randint(10, 100),
-        'product_height_cm': random.randint(5, 50),
-        'product_width_cm': random.randint(10, 80)
-    })
-
-products_df = pd.DataFrame(products_data)
+categories = np.array(['Electronics', 'Fashion', 'Home & Living', 'Beauty', 'Sports', 'Books', 'Toys'])
+
+products_df = pd.DataFrame({
+    'product_id': make_ids('PROD', np.char.zfill(np.arange(1, 51).astype(str), 4)),
+    'product_category_name': rng.choice(categories, size=50),
+    'product_name_length': rng.integers(20, 81, size=50),
+    'product_description_length': rng.integers(100, 501, size=50),
+    'product_photos_qty': rng.integers(1, 6, size=50),
+    'product_weight_g': rng.integers(100, 5001, size=50),
+    'product_length_cm': rng.integers(10, 101, size=50),
+    'product_height_cm': rng.integers(5, 51, size=50),
+    'product_width_cm': rng.integers(10, 81, size=50)
+})
 print(f"    ✓ {len(products_df)} products generated")
 
 # 5. SELLERS (20 sellers)
 print("  - sellers table...")
-sellers_data = []
-
-for i in range(1, 21):
-    sellers_data.append({
-        'seller_id': f'SELL{i:04d}',
-        'seller_zip_code': fake.postcode(),
-        'seller_city': random.choice(['Jakarta', 'Bandung', 'Surabaya', 'Tangerang', 'Bekasi']),
-        'seller_state': random.choice(['DKI Jakarta', 'Jawa Barat', 'Jawa Timur', 'Banten'])
-    })
-
-sellers_df = pd.DataFrame(sellers_data)
+seller_cities = np.array(['Jakarta', 'Bandung', 'Surabaya', 'Tangerang', 'Bekasi'])
+seller_states = np.array(['DKI Jakarta', 'Jawa Barat', 'Jawa Timur', 'Banten'])
+
+sellers_df = pd.DataFrame({
+    'seller_id': make_ids('SELL', np.char.zfill(np.arange(1, 21).astype(str), 4)),
+    'seller_zip_code': rng.choice(postcode_pool, size=20),
+    'seller_city': seller_cities[rng.integers(0, len(seller_cities), size=20)],
+    'seller_state': seller_states[rng.integers(0, len(seller_states), size=20)]
+})
 print(f"    ✓ {len(sellers_df)} sellers generated")
 
 # 6. ORDER_ITEMS (500 items - 1 per order for simplicity)
 print("  - order_items table...")
-order_items_data = []
-
-for i, order in enumerate(orders_data, 1):
-    product = random.choice(products_data)
-    seller = random.choice(sellers_data)
-    price = round(random.uniform(50000, 5000000), 2)
-    
-    order_items_data.append({
-        'order_id': order['order_id'],
-        'order_item_id': i,
-        'product_id': product['product_id'],
-        'seller_id': seller['seller_id'],
-        'shipping_limit_date': order['order_purchase_timestamp'] + timedelta(days=random.randint(5, 15)),
-        'price': price,
-        'freight_value': round(price * 0.1, 2)  # 10% of price
-    })
-
-order_items_df = pd.DataFrame(order_items_data)
+product_id_pool = products_df['product_id'].to_numpy()
+seller_id_pool = sellers_df['seller_id'].to_numpy()
+item_prices = np.round(rng.uniform(50000, 5000000, size=500), 2)
+
+order_items_df = pd.DataFrame({
+    'order_id': order_ids,
+    'order_item_id': np.arange(1, 501),
+    'product_id': rng.choice(product_id_pool, size=500),
+    'seller_id': rng.choice(seller_id_pool, size=500),
+    'shipping_limit_date': order_dates + pd.to_timedelta(rng.integers(5, 16, size=500), unit='D'),
+    'price': item_prices,
+    'freight_value': np.round(item_prices * 0.1, 2)  # 10% of price
+})
 print(f"    ✓ {len(order_items_df)} order items generated")
 
 # ============================================================================
@@ -153,81 +148,148 @@ print(f"    ✓ {len(order_items_df)} order items generated")
 
 print("\n📈 Generating analytics_db data...")
 
+# Spending-segment scoring: 0 = Occasional, 1 = Regular, 2 = VIP.
+# Numba compiles the loop to native code for multi-million-customer runs;
+# without it the np.select fallback is plenty for sample-sized data.
+SEGMENT_LABELS = np.array(['Occasional', 'Regular', 'VIP'])
+
+try:
+    import numba
+
+    @numba.njit(cache=True)
+    def segment_codes(lifetime_values):
+        out = np.empty(lifetime_values.size, np.int8)
+        for i in range(lifetime_values.size):
+            if lifetime_values[i] > 5_000_000:
+                out[i] = 2
+            elif lifetime_values[i] > 2_000_000:
+                out[i] = 1
+            else:
+                out[i] = 0
+        return out
+except ImportError:
+    def segment_codes(lifetime_values):
+        return np.select(
+            [lifetime_values > 5_000_000, lifetime_values > 2_000_000],
+            [2, 1],
+            default=0
+        ).astype(np.int8)
+
 # 7. CUSTOMER_SEGMENTS (derived from customers + orders)
 print("  - customer_segments table...")
-customer_segments_data = []
-
-for customer in customers_data:
-    customer_orders = [o for o in orders_data if o['customer_id'] == customer['customer_id']]
-    total_spent = sum([p['payment_value'] for p in payments_data if p['order_id'] in [o['order_id'] for o in customer_orders]])
-    
-    # Segment based on spending
-    if total_spent > 5000000:
-        segment = 'VIP'
-    elif total_spent > 2000000:
-        segment = 'Regular'
-    else:
-        segment = 'Occasional'
-    
-    last_order = max([o['order_purchase_timestamp'] for o in customer_orders]) if customer_orders else customer['customer_created_at']
-    
-    customer_segments_data.append({
-        'customer_id': customer['customer_id'],
-        'rfm_score': random.randint(1, 5),
-        'segment': segment,
-        'lifetime_value': total_spent,
-        'total_orders': len(customer_orders),
-        'avg_order_value': total_spent / len(customer_orders) if customer_orders else 0,
-        'last_purchase_date': last_order,
-        'updated_at': datetime.now()
-    })
-
-customer_segments_df = pd.DataFrame(customer_segments_data)
+
+# One merge + groupby instead of scanning orders/payments per customer
+order_payments = payments_df.merge(
+    orders_df[['order_id', 'customer_id', 'order_purchase_timestamp']],
+    on='order_id'
+)
+segments_agg = order_payments.groupby('customer_id').agg(
+    lifetime_value=('payment_value', 'sum'),
+    total_orders=('order_id', 'count'),
+    last_purchase_date=('order_purchase_timestamp', 'max')
+)
+
+customer_segments_df = customers_df[['customer_id']].join(segments_agg, on='customer_id')
+customer_segments_df['lifetime_value'] = customer_segments_df['lifetime_value'].fillna(0)
+customer_segments_df['total_orders'] = customer_segments_df['total_orders'].fillna(0).astype(int)
+customer_segments_df['avg_order_value'] = (
+    customer_segments_df['lifetime_value'] / customer_segments_df['total_orders']
+).fillna(0)
+# Customers without orders fall back to their signup date
+customer_segments_df['last_purchase_date'] = customer_segments_df['last_purchase_date'].fillna(
+    pd.to_datetime(customers_df['customer_created_at'])
+)
+
+# Segment based on spending
+customer_segments_df['segment'] = SEGMENT_LABELS[
+    segment_codes(customer_segments_df['lifetime_value'].to_numpy())
+]
+customer_segments_df['rfm_score'] = rng.integers(1, 6, size=len(customer_segments_df))
+customer_segments_df['updated_at'] = datetime.now()
+
+customer_segments_df = customer_segments_df[[
+    'customer_id', 'rfm_score', 'segment', 'lifetime_value', 'total_orders',
+    'avg_order_value', 'last_purchase_date', 'updated_at'
+]]
 print(f"    ✓ {len(customer_segments_df)} customer segments generated")
 
 # 8. DAILY_METRICS (last 90 days)
 print("  - daily_metrics table...")
-daily_metrics_data = []
-start_date = datetime.now() - timedelta(days=90)
-
-for day_offset in range(90):
-    date = start_date + timedelta(days=day_offset)
-    day_orders = [o for o in orders_data if o['order_purchase_timestamp'].date() == date.date()]
-    day_payments = [p for p in payments_data if p['order_id'] in [o['order_id'] for o in day_orders]]
-    
-    total_sales = sum([p['payment_value'] for p in day_payments])
-    total_orders = len(day_orders)
-    new_customers = len([c for c in customers_data if c['customer_created_at'] == date.date()])
-    
-    daily_metrics_data.append({
-        'date': date.date(),
-        'total_sales': total_sales,
-        'total_orders': total_orders,
-        'avg_order_value': total_sales / total_orders if total_orders > 0 else 0,
-        'new_customers': new_customers,
-        'returning_customers': total_orders - new_customers
-    })
-
-daily_metrics_df = pd.DataFrame(daily_metrics_data)
+
+# One hash groupby over the merged orders+payments instead of 90 re-scans
+full_dates = pd.date_range(end=pd.Timestamp.now().normalize(), periods=90)
+order_payments['date'] = order_payments['order_purchase_timestamp'].dt.normalize()
+daily = order_payments.groupby('date').agg(
+    total_sales=('payment_value', 'sum'),
+    total_orders=('order_id', 'count')
+).reindex(full_dates, fill_value=0)
+
+new_customers = (
+    pd.to_datetime(customers_df['customer_created_at'])
+    .value_counts()
+    .reindex(full_dates, fill_value=0)
+)
+
+total_sales = daily['total_sales'].to_numpy()
+total_orders = daily['total_orders'].to_numpy()
+daily_metrics_df = pd.DataFrame({
+    'date': full_dates.date,
+    'total_sales': total_sales,
+    'total_orders': total_orders,
+    'avg_order_value': np.divide(
+        total_sales, total_orders,
+        out=np.zeros_like(total_sales, dtype=float), where=total_orders > 0
+    ),
+    'new_customers': new_customers.to_numpy(),
+    'returning_customers': total_orders - new_customers.to_numpy()
+})
 print(f"    ✓ {len(daily_metrics_df)} daily metrics generated")
 
 # ============================================================================
 # SAVE TO CSV
 # ============================================================================
 
+# Small fixed vocabularies → categorical codes (one int8 per row plus a tiny
+# dictionary) instead of a PyObject string per row
+for _df, _cols in [
+    (customers_df, ['customer_city', 'customer_state']),
+    (orders_df, ['order_status']),
+    (payments_df, ['payment_type']),
+    (products_df, ['product_category_name']),
+    (sellers_df, ['seller_city', 'seller_state']),
+    (customer_segments_df, ['segment']),
+]:
+    for _col in _cols:
+        _df[_col] = _df[_col].astype('category')
+
 print("\n💾 Saving to CSV files...")
 
 import os
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+
 os.makedirs('data/raw', exist_ok=True)
 
-customers_df.to_csv('data/raw/customers.csv', index=False)
-orders_df.to_csv('data/raw/orders.csv', index=False)
-payments_df.to_csv('data/raw/payments.csv', index=False)
-products_df.to_csv('data/raw/products.csv', index=False)
-sellers_df.to_csv('data/raw/sellers.csv', index=False)
-order_items_df.to_csv('data/raw/order_items.csv', index=False)
-customer_segments_df.to_csv('data/raw/customer_segments.csv', index=False)
-daily_metrics_df.to_csv('data/raw/daily_metrics.csv', index=False)
+tables = {
+    'customers': customers_df,
+    'orders': orders_df,
+    'payments': payments_df,
+    'products': products_df,
+    'sellers': sellers_df,
+    'order_items': order_items_df,
+    'customer_segments': customer_segments_df,
+    'daily_metrics': daily_metrics_df
+}
+
+# pyarrow serializes columns in C instead of pandas' per-row CSV writer,
+# and releases the GIL so the eight writes can overlap on threads
+def _write_table(item):
+    name, df = item
+    pa_csv.write_csv(pa.Table.from_pandas(df, preserve_index=False), f'data/raw/{name}.csv')
+
+with ThreadPoolExecutor(max_workers=len(tables)) as executor:
+    list(executor.map(_write_table, tables.items()))
 
 print(f"  ✓ All CSV files saved to data/raw/")
 
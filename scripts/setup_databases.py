@@ -2,32 +2,95 @@
 Database Setup Script
 
 Loads Olist dataset into 3 PostgreSQL databases.
+
+Tables are created from the CSV schema, then populated with PostgreSQL
+COPY — one bulk stream per table instead of per-row INSERTs.
 """
 
+import os
+
 import pandas as pd
 from sqlalchemy import create_engine
-import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
+RAW_DATA_DIR = "data/raw"
+
+# Mapping: database → env var with its URL, list of (csv_file, table_name)
+DB_TABLES = {
+    "sales_db": ("SALES_DB_URL", [
+        ("customers.csv", "customers"),
+        ("orders.csv", "orders"),
+        ("payments.csv", "payments"),
+    ]),
+    "products_db": ("PRODUCTS_DB_URL", [
+        ("products.csv", "products"),
+        ("sellers.csv", "sellers"),
+        ("order_items.csv", "order_items"),
+    ]),
+    "analytics_db": ("ANALYTICS_DB_URL", [
+        ("customer_segments.csv", "customer_segments"),
+        ("daily_metrics.csv", "daily_metrics"),
+    ]),
+}
+
+
+def bulk_load_csv(engine, csv_file: str, table_name: str) -> int:
+    """Create the table from the CSV and bulk load it via COPY FROM STDIN."""
+    filepath = os.path.join(RAW_DATA_DIR, csv_file)
+
+    # Create/replace the typed table structure without inserting any rows
+    df = pd.read_csv(filepath)
+    df.head(0).to_sql(table_name, engine, if_exists="replace", index=False)
+
+    # COPY streams the whole file through one bulk parse+load path
+    conn = engine.raw_connection()
+    try:
+        with conn.cursor() as cur, open(filepath, encoding="utf-8") as f:
+            cur.copy_expert(f'COPY {table_name} FROM STDIN WITH CSV HEADER', f)
+        conn.commit()
+    finally:
+        conn.close()
+
+    return len(df)
+
+
+def setup_database(db_name: str) -> None:
+    """Load all tables for one database."""
+    url_env, tables = DB_TABLES[db_name]
+    db_url = os.getenv(url_env)
+
+    if not db_url:
+        print(f"  ✗ {db_name}: {url_env} not set in .env, skipping")
+        return
+
+    engine = create_engine(db_url)
+    try:
+        for csv_file, table_name in tables:
+            rows = bulk_load_csv(engine, csv_file, table_name)
+            print(f"  ✓ {db_name}.{table_name}: {rows} rows")
+    finally:
+        engine.dispose()
+
+
 def setup_sales_db():
     """Load customers, orders, payments into sales_db"""
-    # TODO: Implement
     print("Setting up sales_db...")
-    pass
+    setup_database("sales_db")
+
 
 def setup_products_db():
     """Load products, sellers, order_items into products_db"""
-    # TODO: Implement
     print("Setting up products_db...")
-    pass
+    setup_database("products_db")
+
 
 def setup_analytics_db():
     """Create derived tables in analytics_db"""
-    # TODO: Implement
     print("Setting up analytics_db...")
-    pass
+    setup_database("analytics_db")
+
 
 if __name__ == "__main__":
     print("🗄️  Setting up databases...")
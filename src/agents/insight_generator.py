@@ -30,7 +30,11 @@ Example:
 
 import json
 import re
+import threading
+from collections import OrderedDict
 from datetime import datetime
+from itertools import islice
+from typing import Iterable
 
 from src.core.llm_base_agent import LLMBaseAgent
 from src.models.agent_state import AgentState
@@ -55,12 +59,37 @@ _VERDICT_KEYWORDS: frozenset[str] = frozenset({"SEHAT", "PERHATIAN", "KRITIS"})
 # Model used when quality_tier="deep". All other agents are unaffected.
 _DEEP_MODEL = "gpt-4.1-mini"
 
+# Output-token ceilings per response_length. Output tokens dominate LLM
+# latency, so a brief answer (1–2 sentences per the prompt) must not reserve
+# the detailed ceiling — the model streams until max_tokens unless it stops.
+_MAX_TOKENS_BY_LENGTH: dict[str, int] = {
+    "brief":    300,
+    "standard": 1000,
+    "detailed": 1500,
+}
+
 _MONTH_ID = [
     "", "Januari", "Februari", "Maret", "April", "Mei", "Juni",
     "Juli", "Agustus", "September", "Oktober", "November", "Desember",
 ]
 
 
+def _rows_to_json(rows: Iterable[dict], limit: int) -> str:
+    """Serialize at most `limit` result rows for an LLM prompt: compact, one row per line.
+
+    indent=2 forces json's pure-Python pretty printer and roughly doubles the
+    whitespace tokens shipped to the LLM; compact separators keep the C fast
+    path, and one line per row keeps the data scannable in the prompt.
+    islice bounds the work without copying the (potentially MAX_ROWS-sized)
+    result list — state.row_count stays the authoritative count, this is a
+    preview.
+    """
+    return "\n".join(
+        json.dumps(row, separators=(",", ":"), default=str)
+        for row in islice(rows, limit)
+    )
+
+
 def _format_date_id(date_str: str) -> str:
     """Convert 'YYYY-MM-DD' to 'DD Nama_Bulan YYYY' in Indonesian."""
     try:
@@ -233,6 +262,52 @@ If no results (0 rows):
 - Suggest alternative queries or time ranges
 """
 
+# Segment-specific answer-pattern guides. Static blocks are rendered once at
+# import; the products guide stays a template because it interpolates the live
+# distinct-product count per request.
+_SEGMENT_GUIDES: dict[str, str] = {
+    "transactions": (
+        "POLA JAWABAN — TRANSAKSI:\n"
+        "- Selalu sebut: total volume, MoM growth %, rata-rata harian, SR.\n"
+        "- Template pembuka: \"Volume [naik/turun] [X]%MoM — [N] transaksi, [D] hari — Verdict: [SEHAT/PERHATIAN/KRITIS]\"\n"
+        "- Anomali: sebutkan hari spesifik jika |vol − mean| > 2× std dev.\n"
+        "- SR: flag hanya jika di bawah 98%. Nilai ≥98% = SEHAT, tidak perlu komentar khusus.\n\n"
+    ),
+    "partners": (
+        "POLA JAWABAN — PARTNER (5 dimensi health):\n"
+        "1. Volume: avg MoM growth seluruh partner → threshold >0% SEHAT\n"
+        "2. Konsentrasi: top-2 revenue share → <50% SEHAT, 50–70% PERHATIAN, >70% KRITIS\n"
+        "3. SR: ada partner SR<95%? → 0=SEHAT, 1=PERHATIAN, ≥2=KRITIS\n"
+        "4. Distribusi: >60% partner tumbuh=SEHAT, 40–60%=PERHATIAN, <40%=KRITIS\n"
+        "5. Streak: 0–1 hari=SEHAT, 2–3=PERHATIAN, ≥4=KRITIS\n"
+        "Majority verdict dari 5 dimensi = overall verdict. Sebut partner Watch/ALERT secara eksplisit.\n"
+        "Template pembuka: \"Ekosistem [N] partner — Verdict: [SEHAT/PERHATIAN/KRITIS]\"\n\n"
+    ),
+    "channels": (
+        "POLA JAWABAN — CHANNEL:\n"
+        f"- Analisis per group lebih informatif: {_CHANNEL_GROUPS_BLOCK}.\n"
+        "- Konsentrasi: satu group >60% = risiko ketergantungan tinggi.\n"
+        "- Efisiensi: revenue/trx tinggi + share rendah = value-driven; share tinggi + rev/trx rendah = volume-driven.\n"
+        "- Template pembuka: \"Channel [nama] mendominasi [X]% share — Verdict: [SEHAT/PERHATIAN/KRITIS]\"\n\n"
+    ),
+}
+
+_PRODUCTS_GUIDE_TEMPLATE = (
+    "POLA JAWABAN — PRODUK:\n"
+    "- Portfolio: hitung berapa produk tumbuh vs turun dari data, sebut top-5 share.\n"
+    "- Konsentrasi revenue: Top-3 <50%=Terdiversifikasi, 50–70%=Moderat, >70%=Ketergantungan tinggi.\n"
+    "- Produk turun: estimasi dampak revenue = |wow%| × total_revenue / 100.\n"
+    "- Template pembuka: \"Portfolio [N] produk — [growing] tumbuh, [declining] turun — Verdict: [SEHAT/PERHATIAN/KRITIS]\"\n"
+    "PENTING — THRESHOLD EXCEPTION untuk produk:\n"
+    "Threshold MoM Volume Growth dan Perubahan transaksi di blok THRESHOLDS di atas\n"
+    "TIDAK BERLAKU untuk produk individual (ada {count} distinct product_name;\n"
+    "volatilitas MoM alami per-produk jauh lebih tinggi dari partner/channel).\n"
+    "DILARANG: assign verdict PERHATIAN/KRITIS berdasarkan fluktuasi MoM volume produk individual.\n"
+    "WAJIB: gunakan bahasa deskriptif — \"produk X turun Y% MoM\" — TANPA verdict per-produk.\n"
+    "Verdict keseluruhan (SEHAT/PERHATIAN/KRITIS) hanya boleh berdasarkan konsentrasi\n"
+    "revenue portofolio atau diversifikasi, BUKAN fluktuasi volume per-produk individual.\n\n"
+)
+
 
 class InsightGenerator(LLMBaseAgent):
     """
@@ -245,8 +320,26 @@ class InsightGenerator(LLMBaseAgent):
     - Handle empty results gracefully
     """
 
+    # Max entries in the prompt-keyed response cache (LRU eviction). Entries
+    # are full insight texts, so the cache is kept smaller than the intent one.
+    _RESPONSE_CACHE_MAX_ENTRIES = 256
+
     def __init__(self) -> None:
-        super().__init__(name="insight_generator", version="1.0.0")
+        super().__init__(name="insight_generator", version="1.1.0")
+
+        # Prompt-keyed response cache. The rendered prompt embeds everything
+        # that shapes the answer — query, serialized results, context
+        # snapshot, layout plan, date blocks — so an identical (model, prompt)
+        # pair can reuse the previous LLM output instead of regenerating it.
+        # The post-LLM guards (brief truncation, verdict closing, KRITIS
+        # append) re-run on every hit; only the raw LLM text is cached.
+        self._response_cache: OrderedDict[tuple[str, str], str] = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        # Singleton agent, concurrent /query requests — cache mutations must
+        # not interleave.
+        self._cache_lock = threading.Lock()
 
     # Intents that benefit from extended thinking (deeper reasoning before answering)
     _THINKING_INTENTS = {
@@ -326,11 +419,29 @@ class InsightGenerator(LLMBaseAgent):
             if getattr(state, "quality_tier", "standard") == "deep":
                 effective_model = _DEEP_MODEL
                 self.log(f"quality_tier=deep → using model '{_DEEP_MODEL}' (default: '{self.model}')")
-            insights = self._call_llm(
-                prompt, max_tokens=1500, temperature=0.3, use_thinking=use_thinking,
-                model=effective_model,
-            )
-            self._record_token_usage(state, model=effective_model or self.model)
+            cache_key = (effective_model or self.model, prompt)
+            with self._cache_lock:
+                cached = self._response_cache.get(cache_key)
+                if cached is not None:
+                    self._response_cache.move_to_end(cache_key)
+            if cached is not None:
+                self.cache_hits += 1
+                self.log("Insight cache hit — skipping LLM call")
+                insights = cached
+            else:
+                self.cache_misses += 1
+                max_tokens = _MAX_TOKENS_BY_LENGTH.get(
+                    plan.get("response_length", "standard"), _MAX_TOKENS_BY_LENGTH["standard"]
+                )
+                insights = self._call_llm(
+                    prompt, max_tokens=max_tokens, temperature=0.3, use_thinking=use_thinking,
+                    model=effective_model,
+                )
+                self._record_token_usage(state, model=effective_model or self.model)
+                with self._cache_lock:
+                    self._response_cache[cache_key] = insights
+                    if len(self._response_cache) > self._RESPONSE_CACHE_MAX_ENTRIES:
+                        self._response_cache.popitem(last=False)
             # Guard: if ResponsePlanner asked for brief, strip any extra sections
             # the LLM added beyond the direct answer (defense-in-depth after context trim).
             if plan.get("response_length") == "brief":
@@ -436,9 +547,7 @@ class InsightGenerator(LLMBaseAgent):
     def _build_single_step_prompt(self, state: AgentState) -> str:
         """Build insight prompt for a single-step query."""
         if state.query_result and state.row_count > 0:
-            results_text = json.dumps(
-                state.query_result[:self._MAX_PROMPT_ROWS], indent=2, default=str
-            )
+            results_text = _rows_to_json(state.query_result, self._MAX_PROMPT_ROWS)
             if state.row_count > self._MAX_PROMPT_ROWS:
                 hidden = state.row_count - self._MAX_PROMPT_ROWS
                 results_text += (
@@ -531,7 +640,7 @@ METODOLOGI ANALISIS — ikuti urutan ini:
                 lines.append("Status: returned 0 rows — no data available for this tool")
                 lines.append("")
             else:
-                preview = json.dumps(tr.data[:15], indent=2, default=str)
+                preview = _rows_to_json(tr.data, 15)
                 lines.append(f"TOOL {i} — {tr.tool_name}: {tr.description}")
                 lines.append(f"SQL: {tr.sql_or_params}")
                 actual = getattr(tr, "actual_entity_count", 0)
@@ -1052,49 +1161,9 @@ SYNTHESIS RULES:
 
     def _build_segment_guide(self, segment: str, product_count: int = 0) -> str:
         """Return compact segment-specific answer pattern guidance."""
-        count = product_count or 882
-        guides: dict[str, str] = {
-            "transactions": (
-                "POLA JAWABAN — TRANSAKSI:\n"
-                "- Selalu sebut: total volume, MoM growth %, rata-rata harian, SR.\n"
-                "- Template pembuka: \"Volume [naik/turun] [X]%MoM — [N] transaksi, [D] hari — Verdict: [SEHAT/PERHATIAN/KRITIS]\"\n"
-                "- Anomali: sebutkan hari spesifik jika |vol − mean| > 2× std dev.\n"
-                "- SR: flag hanya jika di bawah 98%. Nilai ≥98% = SEHAT, tidak perlu komentar khusus.\n\n"
-            ),
-            "products": (
-                "POLA JAWABAN — PRODUK:\n"
-                "- Portfolio: hitung berapa produk tumbuh vs turun dari data, sebut top-5 share.\n"
-                "- Konsentrasi revenue: Top-3 <50%=Terdiversifikasi, 50–70%=Moderat, >70%=Ketergantungan tinggi.\n"
-                "- Produk turun: estimasi dampak revenue = |wow%| × total_revenue / 100.\n"
-                "- Template pembuka: \"Portfolio [N] produk — [growing] tumbuh, [declining] turun — Verdict: [SEHAT/PERHATIAN/KRITIS]\"\n"
-                "PENTING — THRESHOLD EXCEPTION untuk produk:\n"
-                "Threshold MoM Volume Growth dan Perubahan transaksi di blok THRESHOLDS di atas\n"
-                f"TIDAK BERLAKU untuk produk individual (ada {count} distinct product_name;\n"
-                "volatilitas MoM alami per-produk jauh lebih tinggi dari partner/channel).\n"
-                "DILARANG: assign verdict PERHATIAN/KRITIS berdasarkan fluktuasi MoM volume produk individual.\n"
-                "WAJIB: gunakan bahasa deskriptif — \"produk X turun Y% MoM\" — TANPA verdict per-produk.\n"
-                "Verdict keseluruhan (SEHAT/PERHATIAN/KRITIS) hanya boleh berdasarkan konsentrasi\n"
-                "revenue portofolio atau diversifikasi, BUKAN fluktuasi volume per-produk individual.\n\n"
-            ),
-            "partners": (
-                "POLA JAWABAN — PARTNER (5 dimensi health):\n"
-                "1. Volume: avg MoM growth seluruh partner → threshold >0% SEHAT\n"
-                "2. Konsentrasi: top-2 revenue share → <50% SEHAT, 50–70% PERHATIAN, >70% KRITIS\n"
-                "3. SR: ada partner SR<95%? → 0=SEHAT, 1=PERHATIAN, ≥2=KRITIS\n"
-                "4. Distribusi: >60% partner tumbuh=SEHAT, 40–60%=PERHATIAN, <40%=KRITIS\n"
-                "5. Streak: 0–1 hari=SEHAT, 2–3=PERHATIAN, ≥4=KRITIS\n"
-                "Majority verdict dari 5 dimensi = overall verdict. Sebut partner Watch/ALERT secara eksplisit.\n"
-                "Template pembuka: \"Ekosistem [N] partner — Verdict: [SEHAT/PERHATIAN/KRITIS]\"\n\n"
-            ),
-            "channels": (
-                "POLA JAWABAN — CHANNEL:\n"
-                f"- Analisis per group lebih informatif: {_CHANNEL_GROUPS_BLOCK}.\n"
-                "- Konsentrasi: satu group >60% = risiko ketergantungan tinggi.\n"
-                "- Efisiensi: revenue/trx tinggi + share rendah = value-driven; share tinggi + rev/trx rendah = volume-driven.\n"
-                "- Template pembuka: \"Channel [nama] mendominasi [X]% share — Verdict: [SEHAT/PERHATIAN/KRITIS]\"\n\n"
-            ),
-        }
-        return guides.get(segment, "")
+        if segment == "products":
+            return _PRODUCTS_GUIDE_TEMPLATE.format(count=product_count or 882)
+        return _SEGMENT_GUIDES.get(segment, "")
 
     def _build_steps_block(self, step_results: list) -> str:
         """Format step results for the multi-step prompt."""
@@ -1105,7 +1174,7 @@ SYNTHESIS RULES:
                 lines.append("Status: FAILED or returned 0 rows — skip this step")
                 lines.append("")
             else:
-                preview = json.dumps(step.data[:10], indent=2, default=str)
+                preview = _rows_to_json(step.data, 10)
                 lines.append(f"STEP {step.step_number}: {step.description}")
                 lines.append(f"SQL: {step.sql}")
                 lines.append(f"Results ({step.row_count} rows):")
@@ -30,6 +30,8 @@ Example:
 """
 
 import re
+import threading
+from collections import OrderedDict
 from datetime import date
 
 from src.core.llm_base_agent import LLMBaseAgent
@@ -40,6 +42,45 @@ from src.utils.domain_entities import render_channel_group_labels_block, render_
 _PARTNER_LIST         = render_partner_list_block()
 _CHANNEL_GROUP_LABELS = render_channel_group_labels_block()
 
+# The response contract is 4 short lines — no need for a 500-token budget
+_CLASSIFY_MAX_TOKENS = 150
+
+# Below this confidence the fast model's answer is retried once on the
+# originally configured (stronger) model before the result is accepted.
+_ESCALATION_CONFIDENCE = 0.7
+
+# Max entries in the exact-match classification cache (LRU eviction)
+_INTENT_CACHE_MAX_ENTRIES = 1024
+
+# Splits a query into word tokens for the canonical cache fingerprint
+_TOKEN_SPLIT = re.compile(r"\W+", re.UNICODE)
+
+# Fast pre-classification: queries this vague are ambiguous by definition —
+# no metric, entity, or timeframe to map to SQL — so they short-circuit to a
+# clarification request without paying an LLM round-trip. Deliberately
+# narrow: anything with real content words falls through to the LLM.
+_FAST_AMBIGUOUS = re.compile(
+    r"^(?:"
+    r"apa|what|halo|hello|hi|info|data"
+    r"|tampilkan(?:\s+data)?|lihat\s+data"
+    r"|show(?:\s+me)?(?:\s+(?:the\s+)?data)?"
+    r"|tell\s+me\s+more|give\s+me\s+info"
+    r")[\s?!.]*$",
+    re.IGNORECASE,
+)
+
+
+def _canonical_query(query: str) -> str:
+    """Order- and punctuation-insensitive fingerprint of a query.
+
+    "Berapa jumlah customer?" and "jumlah customer berapa" canonicalize to the
+    same string, so trivial paraphrases share one cache entry. Classification
+    depends on which keywords appear, not their order, which makes the
+    token-bag safe here in a way it would not be for SQL generation.
+    """
+    tokens = sorted(t for t in _TOKEN_SPLIT.split(query.casefold()) if t)
+    return " ".join(tokens)
+
 # ── Deterministic root_cause override — three-step check ─────────────────────
 #
 # Step 1: explicit causal phrases → always override (no further check needed)
@@ -153,92 +194,25 @@ _OUT_OF_SCOPE_MESSAGES: dict[str, str] = {
 }
 
 
-class IntentClassifier(LLMBaseAgent):
-    """
-    Classify user query intent using Claude.
-
-    Determines:
-    - Query category (simple_select, aggregation, etc.)
-    - Whether query needs clarification
-    - SQL generation strategy hint for SQL Generator
-    """
-
-    def __init__(self) -> None:
-        super().__init__(name="intent_classifier", version="1.0.0")
-
-    def execute(self, state: AgentState) -> AgentState:
-        """
-        Classify intent of user query.
-
-        Args:
-            state: Pipeline state with state.query and state.conversation_history
-
-        Returns:
-            Updated state with intent classification results
-        """
-        prompt = self._build_prompt(state)
-        response = self._call_llm(prompt, max_tokens=500, temperature=0)
-        self._record_token_usage(state, model=self.model)
-        intent = self._parse_response(response)
-
-        # Hard override: "kenapa / mengapa / apa penyebab" questions are always
-        # root_cause_analysis regardless of what the LLM classified them as.
-        # Check original_query because QueryRewriter may have removed "kenapa" from state.query.
-        check_query = state.original_query or state.query
-        if _is_root_cause_override(check_query):
-            if intent["category"] not in ("root_cause_analysis", "ambiguous"):
-                self.log(
-                    f"Override: '{intent['category']}' → 'root_cause_analysis' (why-question detected)",
-                    level="warning",
-                )
-                intent = {
-                    **intent,
-                    "category": "root_cause_analysis",
-                    "sql_strategy": INTENT_SQL_STRATEGY["root_cause_analysis"],
-                }
-
-        state.intent = intent
-        # out_of_scope is NOT ambiguous — it's a clear query that we can't answer.
-        # The pipeline handles it with an early return + informative message.
-        state.needs_clarification = intent["category"] == "ambiguous"
-
-        if state.needs_clarification:
-            state.clarification_reason = intent["reason"]
-
-        self.log(
-            f"Intent: {intent['category']} segment={intent.get('segment', '?')} "
-            f"(confidence: {intent['confidence']:.2f}, "
-            f"needs_clarification: {state.needs_clarification})"
-        )
-
-        return state
-
-    def _build_prompt(self, state: AgentState) -> str:
-        """Build classification prompt, including recent conversation context if available."""
-        categories_text = "\n".join([
-            f"  {cat} — {desc}"
-            for cat, desc in INTENT_CATEGORIES.items()
-        ])
-        segments_text = "\n".join([
-            f"  {seg} — {desc}"
-            for seg, desc in SEGMENT_CATEGORIES.items()
-        ])
-
-        history_block = self._build_history_block(state.conversation_history)
-        today = date.today().strftime("%Y-%m-%d")
+# Static classification instructions — taxonomy, response format, rules, and
+# examples never change between requests, so they are built once at import and
+# sent as the system prompt. On Anthropic this prefix is cached provider-side
+# (cache_control=ephemeral), so repeat classifications only pay prefill for the
+# short dynamic user portion (date, history, query).
+_CATEGORIES_TEXT = "\n".join(
+    f"  {cat} — {desc}" for cat, desc in INTENT_CATEGORIES.items()
+)
+_SEGMENTS_TEXT = "\n".join(
+    f"  {seg} — {desc}" for seg, desc in SEGMENT_CATEGORIES.items()
+)
 
-        return f"""You are an intent classifier for a Telkomsel digital payment analytics chatbot.
-
-TODAY'S DATE: {today}
-Resolve relative time: "bulan ini"=current month, "minggu ini"=current week, "hari ini"=today.
+_INTENT_SYSTEM_PROMPT = f"""You are an intent classifier for a Telkomsel digital payment analytics chatbot.
 
 STEP 1 — Classify query into ONE intent category:
-{categories_text}
+{_CATEGORIES_TEXT}
 
 STEP 2 — Identify the business segment:
-{segments_text}
-
-{history_block}USER QUERY: "{state.query}"
+{_SEGMENTS_TEXT}
 
 Respond in this EXACT format (4 lines):
 INTENT: [category]
@@ -305,6 +279,179 @@ INTENT: complex_analytics
 SEGMENT: partners
 CONFIDENCE: 0.95
 REASON: Membutuhkan grouping multi-dimensi (per hari × per partner) dengan dua metrik sekaligus — tipikal complex_analytics. Tidak ada kata "kenapa/mengapa", tidak ada leaderboard, tidak ada permintaan saran.
+"""
+
+
+class IntentClassifier(LLMBaseAgent):
+    """
+    Classify user query intent using Claude.
+
+    Determines:
+    - Query category (simple_select, aggregation, etc.)
+    - Whether query needs clarification
+    - SQL generation strategy hint for SQL Generator
+    """
+
+    def __init__(self) -> None:
+        super().__init__(name="intent_classifier", version="1.1.0")
+        # Escalation target: the model resolved from config, captured before
+        # the fast-model downgrade so low-confidence results can retry on it.
+        self._escalation_model = self.model
+        self._maybe_use_fast_model()
+
+        # Classification response cache. Runs at temperature=0, so the same
+        # inputs are deterministic — repeats skip the LLM round-trip entirely.
+        # Keyed on (model, date, history, canonical query): the canonical
+        # token-bag also catches trivial paraphrases and punctuation/case
+        # variants, not just byte-identical repeats. Stored pre-override: the
+        # root-cause override is recomputed per call because it reads
+        # original_query, which is not part of the key.
+        self._response_cache: OrderedDict[tuple[str, str, str, str], dict] = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        # Singleton agent, concurrent /query requests — cache mutations must
+        # not interleave.
+        self._cache_lock = threading.Lock()
+
+    def _maybe_use_fast_model(self) -> None:
+        """Downgrade to a fast model unless explicitly overridden in env.
+
+        Classification is a low-reasoning task on the hot path before every
+        query, so speed/cost wins.
+        """
+        fast = self._fast_model_for_provider()
+        if fast and fast != self.model:
+            self.log(f"Using fast model for classification: {fast} (was {self.model})")
+            self.model = fast
+
+    def execute(self, state: AgentState) -> AgentState:
+        """
+        Classify intent of user query.
+
+        Args:
+            state: Pipeline state with state.query and state.conversation_history
+
+        Returns:
+            Updated state with intent classification results
+        """
+        if _FAST_AMBIGUOUS.match(state.query.strip()):
+            self.log("Fast-path: obviously vague query — skipping LLM call")
+            state.intent = {
+                "category":     "ambiguous",
+                "segment":      "general",
+                "confidence":   1.0,
+                "reason":       "Query terlalu umum — tidak ada metrik, entitas, atau periode yang bisa diterjemahkan ke SQL.",
+                "sql_strategy": INTENT_SQL_STRATEGY["ambiguous"],
+            }
+            state.needs_clarification = True
+            state.clarification_reason = state.intent["reason"]
+            return state
+
+        prompt = self._build_prompt(state)
+        cache_key = (
+            self.model,
+            date.today().isoformat(),
+            self._build_history_block(state.conversation_history),
+            _canonical_query(state.query),
+        )
+        with self._cache_lock:
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                self._response_cache.move_to_end(cache_key)
+
+        if cached is not None:
+            self.cache_hits += 1
+            self.log("Classification cache hit — skipping LLM call")
+            intent = dict(cached)
+        else:
+            self.cache_misses += 1
+            intent = self._classify(state, prompt)
+            # Only successful classifications are cached — exceptions above
+            # propagate before this line, so failures never poison the cache.
+            with self._cache_lock:
+                self._response_cache[cache_key] = dict(intent)
+                if len(self._response_cache) > _INTENT_CACHE_MAX_ENTRIES:
+                    self._response_cache.popitem(last=False)
+
+        # Hard override: "kenapa / mengapa / apa penyebab" questions are always
+        # root_cause_analysis regardless of what the LLM classified them as.
+        # Check original_query because QueryRewriter may have removed "kenapa" from state.query.
+        check_query = state.original_query or state.query
+        if _is_root_cause_override(check_query):
+            if intent["category"] not in ("root_cause_analysis", "ambiguous"):
+                self.log(
+                    f"Override: '{intent['category']}' → 'root_cause_analysis' (why-question detected)",
+                    level="warning",
+                )
+                intent = {
+                    **intent,
+                    "category": "root_cause_analysis",
+                    "sql_strategy": INTENT_SQL_STRATEGY["root_cause_analysis"],
+                }
+
+        state.intent = intent
+        # out_of_scope is NOT ambiguous — it's a clear query that we can't answer.
+        # The pipeline handles it with an early return + informative message.
+        state.needs_clarification = intent["category"] == "ambiguous"
+
+        if state.needs_clarification:
+            state.clarification_reason = intent["reason"]
+
+        self.log(
+            f"Intent: {intent['category']} segment={intent.get('segment', '?')} "
+            f"(confidence: {intent['confidence']:.2f}, "
+            f"needs_clarification: {state.needs_clarification})"
+        )
+
+        return state
+
+    def _classify(self, state: AgentState, prompt: str) -> dict:
+        """Run the LLM classification, escalating once on low confidence."""
+        response = self._call_llm(
+            prompt,
+            max_tokens=_CLASSIFY_MAX_TOKENS,
+            temperature=0,
+            system=_INTENT_SYSTEM_PROMPT,
+        )
+        self._record_token_usage(state, model=self.model)
+        intent = self._parse_response(response)
+
+        # Cheap retry cascade: a shaky fast-model answer is re-run once on the
+        # stronger configured model before we accept it (or mark ambiguous).
+        if (
+            intent["confidence"] < _ESCALATION_CONFIDENCE
+            and self.model != self._escalation_model
+        ):
+            self.log(
+                f"Low confidence ({intent['confidence']:.2f}) on '{self.model}' "
+                f"— escalating to '{self._escalation_model}'"
+            )
+            response = self._call_llm(
+                prompt,
+                max_tokens=_CLASSIFY_MAX_TOKENS,
+                temperature=0,
+                system=_INTENT_SYSTEM_PROMPT,
+                model=self._escalation_model,
+            )
+            self._record_token_usage(state, model=self._escalation_model)
+            intent = self._parse_response(response)
+
+        return intent
+
+    def _build_prompt(self, state: AgentState) -> str:
+        """Build the dynamic user portion of the prompt (date, history, query).
+
+        Static instructions (taxonomy, rules, examples) live in
+        _INTENT_SYSTEM_PROMPT and are passed via system= for prompt caching.
+        """
+        history_block = self._build_history_block(state.conversation_history)
+        today = date.today().strftime("%Y-%m-%d")
+
+        return f"""TODAY'S DATE: {today}
+Resolve relative time: "bulan ini"=current month, "minggu ini"=current week, "hari ini"=today.
+
+{history_block}USER QUERY: "{state.query}"
 
 Your response:"""
 
@@ -332,19 +479,26 @@ Your response:"""
         confidence = 0.0
         reason     = ""
 
+        # partition splits on the first ':' only, so a reason like
+        # "matches INTENT: rules" can never be mangled the way a
+        # replace("INTENT:", "") based parser would mangle it.
         for line in response.strip().split("\n"):
-            line = line.strip()
-            if line.startswith("INTENT:"):
-                intent_str = line.replace("INTENT:", "").strip().lower()
-            elif line.startswith("SEGMENT:"):
-                segment = line.replace("SEGMENT:", "").strip().lower()
-            elif line.startswith("CONFIDENCE:"):
-                try:
-                    confidence = float(line.replace("CONFIDENCE:", "").strip())
-                except ValueError:
-                    confidence = 0.5
-            elif line.startswith("REASON:"):
-                reason = line.replace("REASON:", "").strip()
+            key, sep, value = line.strip().partition(":")
+            if not sep:
+                continue
+            value = value.strip()
+            match key.strip().upper():
+                case "INTENT":
+                    intent_str = value.lower()
+                case "SEGMENT":
+                    segment = value.lower()
+                case "CONFIDENCE":
+                    try:
+                        confidence = float(value)
+                    except ValueError:
+                        confidence = 0.5
+                case "REASON":
+                    reason = value
 
         if intent_str not in INTENT_CATEGORIES:
             intent_str = "ambiguous"
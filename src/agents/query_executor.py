@@ -24,17 +24,29 @@ Example:
     [{"total": 100}]
 """
 
-from dotenv import load_dotenv
-from sqlalchemy import create_engine, text
-from sqlalchemy.engine import Engine
-from sqlalchemy.exc import OperationalError, ProgrammingError, SQLAlchemyError
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+    from sqlalchemy.sql.elements import TextClause
 
 from src.core.base_agent import BaseAgent
 from src.core.config import Config
 from src.models.agent_state import AgentState
 from src.utils.exceptions import QueryExecutionError
 
-load_dotenv()
+# Rows fetched per server-side cursor batch. Keeps peak memory O(chunk)
+# instead of O(result) for large result sets.
+_STREAM_CHUNK_ROWS = 1000
+
+# SQLAlchemy statement-compile cache per engine; sized above the default 500
+# so repeated chatbot queries skip the compile step.
+_SQL_COMPILE_CACHE_SIZE = 1200
+
+# Max memoized TextClause objects for repeated identical SQL strings.
+_TEXT_CACHE_MAX_ENTRIES = 256
 
 
 class QueryExecutor(BaseAgent):
@@ -56,7 +68,14 @@ class QueryExecutor(BaseAgent):
         super().__init__(name="query_executor", version="1.0.0")
         self.timeout_seconds = timeout_seconds or Config.TIMEOUT_SECONDS
         self.max_rows = max_rows or Config.MAX_ROWS
-        self.engines: dict[str, Engine] = self._create_engines()
+        self.engines: dict[str, "Engine"] = self._create_engines()
+
+        # TextClause objects are immutable, so repeated identical SQL reuses
+        # the same clause (and its compile-cache entry) instead of rebuilding.
+        self._text_cache: OrderedDict[str, "TextClause"] = OrderedDict()
+        # Singleton agent, concurrent /query requests — cache mutations must
+        # not interleave.
+        self._cache_lock = threading.Lock()
 
         self.log(
             f"Initialized: timeout={self.timeout_seconds}s, "
@@ -87,17 +106,32 @@ class QueryExecutor(BaseAgent):
                 details={"available": list(self.engines.keys())}
             )
 
+        from sqlalchemy.exc import OperationalError, ProgrammingError, SQLAlchemyError
+
         engine = self.engines[state.database]
-        timeout_ms = self.timeout_seconds * 1000
 
         try:
+            # statement_timeout is set at connect time (see _create_engines),
+            # so each query costs a single roundtrip.
             with engine.connect() as conn:
-                conn.execute(text(f"SET statement_timeout = {timeout_ms}"))
-                result = conn.execute(text(state.validated_sql))
-                rows = result.fetchmany(self.max_rows)
-
-                columns = list(result.keys())
-                data = [dict(zip(columns, row)) for row in rows] if rows else []
+                # stream_results uses a server-side (named) cursor, so the
+                # driver buffers one chunk at a time instead of the full
+                # response while we accumulate up to max_rows.
+                result = conn.execution_options(
+                    stream_results=True,
+                    max_row_buffer=_STREAM_CHUNK_ROWS,
+                ).execute(self._text_clause(state.validated_sql))
+
+                # mappings() yields RowMapping views built in the driver
+                # layer — cheaper than a Python-level dict(zip(...)) per row.
+                rows: list = []
+                for partition in result.mappings().partitions(_STREAM_CHUNK_ROWS):
+                    rows.extend(partition)
+                    if len(rows) >= self.max_rows:
+                        del rows[self.max_rows:]
+                        break
+
+                data = [dict(row) for row in rows]
 
                 state.query_result = data
                 state.row_count = len(data)
@@ -124,32 +158,75 @@ class QueryExecutor(BaseAgent):
                 message=f"Database error: {e}"
             ) from e
 
-    def _create_engines(self) -> dict[str, Engine]:
+    def _text_clause(self, sql: str) -> "TextClause":
+        """Return a memoized TextClause for the given SQL string (LRU)."""
+        with self._cache_lock:
+            stmt = self._text_cache.get(sql)
+            if stmt is not None:
+                self._text_cache.move_to_end(sql)
+                return stmt
+
+        from sqlalchemy import text
+
+        stmt = text(sql)
+        with self._cache_lock:
+            self._text_cache[sql] = stmt
+            if len(self._text_cache) > _TEXT_CACHE_MAX_ENTRIES:
+                self._text_cache.popitem(last=False)
+        return stmt
+
+    def _create_engines(self) -> dict[str, "Engine"]:
         """Create pooled SQLAlchemy engines for all configured databases."""
-        engines: dict[str, Engine] = {}
+        # Imported here so that importing this module (CLI tools, tests that
+        # patch _create_engines) doesn't pay SQLAlchemy's import cost.
+        from concurrent.futures import ThreadPoolExecutor
+        from sqlalchemy import create_engine, text
+
+        candidates: dict[str, "Engine"] = {}
 
         for db_name, db_url in Config.DB_URLS.items():
             if not db_url:
                 self.log(f"URL not set for {db_name}, skipping", level="warning")
                 continue
 
-            engine = create_engine(
+            candidates[db_name] = create_engine(
                 db_url,
-                pool_pre_ping=True,
+                # pool_recycle already rotates stale connections; skipping
+                # pre-ping saves a SELECT 1 roundtrip on every checkout.
+                pool_pre_ping=False,
                 pool_size=Config.POOL_SIZE,
                 max_overflow=Config.MAX_OVERFLOW,
                 pool_timeout=Config.POOL_TIMEOUT,
                 pool_recycle=Config.POOL_RECYCLE,
+                # Set the statement timeout once per physical connection
+                # instead of issuing SET statement_timeout per query.
+                connect_args={
+                    "options": f"-c statement_timeout={self.timeout_seconds * 1000}"
+                },
+                query_cache_size=_SQL_COMPILE_CACHE_SIZE,
                 echo=False,
             )
+        def probe(item: tuple[str, "Engine"]) -> tuple[str, "Engine", Exception | None]:
+            db_name, engine = item
             try:
                 with engine.connect() as conn:
                     conn.execute(text("SELECT 1"))
-                engines[db_name] = engine
-                self.log(f"Connected to {db_name}")
+                return db_name, engine, None
             except Exception as e:
-                self.log(f"Failed to connect to {db_name}: {e}", level="error")
-                engine.dispose()
+                return db_name, engine, e
+
+        # The probes are independent I/O — run them concurrently so cold
+        # start pays one roundtrip of latency instead of one per database.
+        engines: dict[str, "Engine"] = {}
+        if candidates:
+            with ThreadPoolExecutor(max_workers=len(candidates)) as pool:
+                for db_name, engine, error in pool.map(probe, candidates.items()):
+                    if error is None:
+                        engines[db_name] = engine
+                        self.log(f"Connected to {db_name}")
+                    else:
+                        self.log(f"Failed to connect to {db_name}: {error}", level="error")
+                        engine.dispose()
 
         if not engines:
             raise QueryExecutionError(
@@ -169,8 +246,10 @@ class QueryExecutor(BaseAgent):
         status: dict[str, str] = {}
         for db_name, engine in self.engines.items():
             try:
+                # exec_driver_sql skips TextClause construction and compile —
+                # the ping needs none of the statement machinery.
                 with engine.connect() as conn:
-                    conn.execute(text("SELECT 1"))
+                    conn.exec_driver_sql("SELECT 1")
                 status[db_name] = "healthy"
             except Exception as e:
                 status[db_name] = f"error: {e}"
@@ -73,7 +73,6 @@ true otherwise when visual_blocks is non-empty.
 """
 
 import json
-import os
 
 from src.core.llm_base_agent import LLMBaseAgent
 from src.models.agent_state import AgentState
@@ -85,15 +84,6 @@ _PARTNER_SEGMENT_KW = frozenset({"partner", "mitra"} | get_partner_keywords())
 _CHANNEL_SEGMENT_KW = frozenset({"channel", "saluran", "kanal"} | get_channel_keywords())
 _CLIENT_PLATFORM    = get_client_platform()
 
-# Cheap default models per provider — planner doesn't need full reasoning power
-_CHEAP_MODELS: dict[str, str] = {
-    "openai":     "gpt-4o-mini",
-    "anthropic":  "claude-haiku-4-5-20251001",
-    "groq":       "llama3-8b-8192",
-    "gemini":     "gemini-1.5-flash",
-    "openrouter": "google/gemini-2.5-flash",
-}
-
 _VALID_VISUAL_TYPES = {
     "line_chart", "bar_chart", "diverging_bar_chart", "donut_chart",
     "grouped_bar_chart",
@@ -132,10 +122,12 @@ class ResponsePlanner(LLMBaseAgent):
         self._maybe_use_cheap_model()
 
     def _maybe_use_cheap_model(self) -> None:
-        """Downgrade to cheaper model unless explicitly overridden in env."""
-        if os.getenv("RESPONSE_PLANNER_MODEL"):
-            return
-        cheap = _CHEAP_MODELS.get(self.provider)
+        """Downgrade to a cheaper model unless explicitly overridden in env.
+
+        The planner doesn't need full reasoning power — no prose generation,
+        only JSON classification.
+        """
+        cheap = self._fast_model_for_provider()
         if cheap and cheap != self.model:
             self.log(f"Using cheap model for planning: {cheap} (was {self.model})")
             self.model = cheap
@@ -25,13 +25,44 @@ Example:
 
 import json
 import re
+import threading
+from collections import OrderedDict
 
+from src.core.config import Config
 from src.core.llm_base_agent import LLMBaseAgent
 from src.models.agent_state import AgentState
 from src.models.retrieved_table import RetrievedTable
 
-# Valid category values the LLM may return.
-_VALID_CATEGORIES = {"ESSENTIAL", "OPTIONAL", "EXCLUDED"}
+# Markdown code fences the model may still wrap the JSON in.
+_FENCE_PATTERN = re.compile(r"```(?:json)?|```")
+
+# Static rubric sent as the system prompt. Keeping it out of the user prompt
+# lets Anthropic's prompt caching reuse it across evaluations, so each call
+# only pays for the query + tables payload.
+_EVALUATOR_SYSTEM_PROMPT = """You are a database schema analyst. Decide which tables are needed to answer the query.
+
+Categories:
+- ESSENTIAL: directly required to answer the query
+- OPTIONAL: adds useful context but not strictly necessary
+- EXCLUDED: not relevant to this query
+
+Respond with ONLY valid JSON — no explanation, no markdown, no text outside the JSON.
+
+{
+  "tables": [
+    {"name": "<db_name.table_name>", "category": "ESSENTIAL|OPTIONAL|EXCLUDED", "reason": "<one sentence>"},
+    ...
+  ]
+}"""
+
+# Response budget: one JSON entry per table plus envelope overhead. Far below
+# the old flat 1000 for typical 3-8 table evaluations.
+_BASE_RESPONSE_TOKENS = 100
+_TOKENS_PER_TABLE = 60
+
+# Retrieval lists feeding RRF fusion (ChromaDB, BM25, graph) — bounds the
+# max attainable fused score at _N_RETRIEVERS / (RRF_K + 1).
+_N_RETRIEVERS = 3
 
 
 class RetrievalEvaluator(LLMBaseAgent):
@@ -46,8 +77,23 @@ class RetrievalEvaluator(LLMBaseAgent):
     Output is structured JSON so parsing never depends on free-text line format.
     """
 
+    # Max entries in the (model, query, table-set)-keyed response cache.
+    _RESPONSE_CACHE_MAX_ENTRIES = 512
+
     def __init__(self) -> None:
-        super().__init__(name="retrieval_evaluator", version="2.0.0")
+        super().__init__(name="retrieval_evaluator", version="2.1.0")
+
+        # Raw-response cache: an identical query over the identical retrieved
+        # table set always yields the same categorization, so the LLM call can
+        # be skipped entirely. Only the response text is cached — parsing
+        # re-runs against the current RetrievedTable objects.
+        self._response_cache: OrderedDict[tuple[str, str, frozenset[str]], str] = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        # Singleton agent, concurrent /query requests — cache mutations must
+        # not interleave.
+        self._cache_lock = threading.Lock()
 
     def execute(self, state: AgentState) -> AgentState:
         """
@@ -66,16 +112,100 @@ class RetrievalEvaluator(LLMBaseAgent):
             self.log(f"Skipped evaluation, only {len(retrieved)} tables retrieved")
             return state
 
-        prompt = self._build_prompt(state.query, retrieved)
-        response = self._call_llm(prompt, max_tokens=1000, temperature=0)
-        self._record_token_usage(state, model=self.model)
+        shortcut = self._score_short_circuit(retrieved)
+        if shortcut is not None:
+            essential, optional, excluded = shortcut
+            self._finalize(state, retrieved, essential, optional, excluded)
+            return state
+
+        cache_key = (
+            self.model,
+            state.query.strip().lower(),
+            frozenset(table.full_name for table in retrieved),
+        )
+        with self._cache_lock:
+            response = self._response_cache.get(cache_key)
+            if response is not None:
+                self._response_cache.move_to_end(cache_key)
+
+        if response is not None:
+            self.cache_hits += 1
+            self.log("Response cache hit — skipping LLM call")
+        else:
+            self.cache_misses += 1
+            prompt = self._build_prompt(state.query, retrieved)
+            max_tokens = min(
+                1000, _BASE_RESPONSE_TOKENS + _TOKENS_PER_TABLE * len(retrieved)
+            )
+            response = self._call_llm(
+                prompt,
+                max_tokens=max_tokens,
+                temperature=0,
+                system=_EVALUATOR_SYSTEM_PROMPT,
+            )
+            self._record_token_usage(state, model=self.model)
+            with self._cache_lock:
+                self._response_cache[cache_key] = response
+                if len(self._response_cache) > self._RESPONSE_CACHE_MAX_ENTRIES:
+                    self._response_cache.popitem(last=False)
+
         essential, optional, excluded = self._parse_response(response, retrieved)
+        self._finalize(state, retrieved, essential, optional, excluded)
+        return state
+
+    def _score_short_circuit(
+        self,
+        tables: list[RetrievedTable],
+    ) -> tuple[list[RetrievedTable], list[RetrievedTable], list[RetrievedTable]] | None:
+        """
+        Categorize on similarity scores alone when the ranking is unambiguous.
+
+        Scores are RRF-fused (bounded by _N_RETRIEVERS / (RRF_K + 1), not
+        cosine [0, 1]), so the thresholds apply to relative magnitudes: HIGH
+        is the fraction of the max attainable fused score the top table must
+        reach, LOW the fraction of the top score the runner-up must stay
+        under, and the cluster epsilon is the spread relative to the top.
 
+        Returns (essential, optional, excluded) when the LLM call can be
+        skipped, or None when an LLM evaluation is needed.
+        """
+        ranked = sorted(tables, key=lambda t: t.similarity_score, reverse=True)
+        top = ranked[0].similarity_score
+        if top <= 0.0:
+            return None
+
+        max_attainable = _N_RETRIEVERS / (Config.RRF_K + 1)
+
+        # One table clearly dominates — near-unanimous top rank across the
+        # retrievers with the runner-up well behind it. Keep it, drop the rest.
+        if (
+            top >= Config.EVAL_SHORT_CIRCUIT_HIGH * max_attainable
+            and ranked[1].similarity_score < Config.EVAL_SHORT_CIRCUIT_LOW * top
+        ):
+            self.log("Score short-circuit: dominant top table — skipping LLM call")
+            return [ranked[0]], [], ranked[1:]
+
+        # All scores cluster tightly — ranking carries no signal, keep all.
+        if (top - ranked[-1].similarity_score) / top <= Config.EVAL_SCORE_CLUSTER_EPS:
+            self.log("Score short-circuit: clustered scores — keeping all tables")
+            return list(tables), [], []
+
+        return None
+
+    def _finalize(
+        self,
+        state: AgentState,
+        retrieved: list[RetrievedTable],
+        essential: list[RetrievedTable],
+        optional: list[RetrievedTable],
+        excluded: list[RetrievedTable],
+    ) -> None:
+        """Filter categorized tables to the active database and write to state."""
         all_relevant = essential + optional
         evaluated = [t for t in all_relevant if t.db_name == state.database]
 
         if not evaluated:
-            # LLM was too conservative — fall back to all retrieved tables for this DB
+            # Evaluation was too conservative — fall back to all retrieved tables for this DB
             self.log(
                 "Evaluation yielded 0 tables for database — falling back to all retrieved tables",
                 level="warning",
@@ -89,10 +219,8 @@ class RetrievalEvaluator(LLMBaseAgent):
             f"{len(optional)} optional, {len(excluded)} excluded"
         )
 
-        return state
-
     def _build_prompt(self, query: str, tables: list[RetrievedTable]) -> str:
-        """Build evaluation prompt that requests structured JSON output."""
+        """Build the dynamic prompt tail (the rubric lives in the system prompt)."""
         tables_info = []
         for table in tables:
             entry: dict = {
@@ -106,26 +234,10 @@ class RetrievalEvaluator(LLMBaseAgent):
 
         tables_json = json.dumps(tables_info, indent=2)
 
-        return f"""You are a database schema analyst. Decide which tables are needed to answer the query.
-
-USER QUERY: "{query}"
+        return f"""USER QUERY: "{query}"
 
 RETRIEVED TABLES:
-{tables_json}
-
-Categories:
-- ESSENTIAL: directly required to answer the query
-- OPTIONAL: adds useful context but not strictly necessary
-- EXCLUDED: not relevant to this query
-
-Respond with ONLY valid JSON — no explanation, no markdown, no text outside the JSON.
-
-{{
-  "tables": [
-    {{"name": "<db_name.table_name>", "category": "ESSENTIAL|OPTIONAL|EXCLUDED", "reason": "<one sentence>"}},
-    ...
-  ]
-}}"""
+{tables_json}"""
 
     def _parse_response(
         self,
@@ -138,14 +250,20 @@ Respond with ONLY valid JSON — no explanation, no markdown, no text outside th
         Falls back to all-essential if JSON is malformed or missing.
         """
         table_map = {table.full_name: table for table in tables}
+        # Secondary index on bare table names so short-name lookups are O(1)
+        # instead of scanning the table list per response entry.
+        name_index = {table.table_name: table for table in tables}
 
         essential: list[RetrievedTable] = []
         optional: list[RetrievedTable] = []
         excluded: list[RetrievedTable] = []
+        # Single hash lookup routes each entry to its bucket — replaces the
+        # category if/elif chain and doubles as the validity check.
+        buckets = {"ESSENTIAL": essential, "OPTIONAL": optional, "EXCLUDED": excluded}
 
         try:
             # Strip optional markdown fences the model may still emit
-            cleaned = re.sub(r"```(?:json)?|```", "", response).strip()
+            cleaned = _FENCE_PATTERN.sub("", response).strip()
             data = json.loads(cleaned)
             entries = data.get("tables", [])
 
@@ -153,25 +271,21 @@ Respond with ONLY valid JSON — no explanation, no markdown, no text outside th
                 name = entry.get("name", "").strip()
                 category = entry.get("category", "").upper().strip()
 
-                if category not in _VALID_CATEGORIES:
+                bucket = buckets.get(category)
+                if bucket is None:
                     self.log(f"Unknown category '{category}' for '{name}' — skipping", level="warning")
                     continue
 
-                # Match by exact full_name or by table_name suffix
-                table_obj = table_map.get(name) or next(
-                    (t for t in tables if t.table_name == name or t.full_name == name),
-                    None,
-                )
+                # Match by exact full_name, or by bare table_name when the
+                # model omitted the db prefix
+                table_obj = table_map.get(name)
+                if table_obj is None and "." not in name:
+                    table_obj = name_index.get(name)
                 if table_obj is None:
                     self.log(f"Table '{name}' from LLM response not found in retrieved set — skipping", level="warning")
                     continue
 
-                if category == "ESSENTIAL":
-                    essential.append(table_obj)
-                elif category == "OPTIONAL":
-                    optional.append(table_obj)
-                else:
-                    excluded.append(table_obj)
+                bucket.append(table_obj)
 
         except (json.JSONDecodeError, AttributeError, TypeError) as exc:
             self.log(f"JSON parse failed ({exc}) — using all tables as essential", level="warning")
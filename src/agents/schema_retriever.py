@@ -25,16 +25,21 @@ Example:
     >>> print(state.retrieved_tables)
 """
 
+import atexit
 import json
 import os
 import pickle
 import re
-from typing import Any
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any
 
-import chromadb
 import networkx as nx
-from chromadb.utils import embedding_functions
-from dotenv import load_dotenv
+import numpy as np
+
+if TYPE_CHECKING:
+    import chromadb
 
 from src.core.base_agent import BaseAgent
 from src.core.config import Config
@@ -42,14 +47,38 @@ from src.models.agent_state import AgentState
 from src.models.retrieved_table import RetrievedTable
 from src.utils.exceptions import SchemaRetrievalError
 
-load_dotenv()
-
 # For complex / multi-table / root-cause queries, retrieve extra candidates so
 # RetrievalEvaluator has a wider pool to filter from without increasing noise for
 # simple queries.
 _RECALL_BOOST   = 2
 _RECALL_INTENTS = frozenset({"multi_table_join", "complex_analytics", "root_cause_analysis"})
 
+# Semantic cache: paraphrased queries whose embeddings are this similar reuse
+# the cached ChromaDB result instead of re-running the HNSW search.
+_SEMANTIC_CACHE_THRESHOLD   = 0.95
+_SEMANTIC_CACHE_MAX_ENTRIES = 1024
+
+# Shared OpenAI client for embedding calls — one keepalive connection pool
+# per process instead of a fresh httpx session (and TLS handshake) per
+# SchemaRetriever instance. Built lazily so importing this module stays cheap.
+_embed_client = None
+
+
+def _get_embed_client(api_key: str):
+    global _embed_client
+    if _embed_client is None:
+        import httpx
+        import openai
+
+        _embed_client = openai.OpenAI(
+            api_key=api_key,
+            http_client=httpx.Client(
+                timeout=30.0,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=40),
+            ),
+        )
+    return _embed_client
+
 
 class SchemaRetriever(BaseAgent):
     """
@@ -59,14 +88,45 @@ class SchemaRetriever(BaseAgent):
     more accurate and robust table retrieval.
     """
 
+    # Max entries in the exact-match retrieval cache (LRU eviction).
+    _RETRIEVE_CACHE_MAX_ENTRIES = 512
+
     def __init__(self, top_k: int = Config.TOP_K_RETRIEVAL) -> None:
-        super().__init__(name="schema_retriever", version="2.0.0")
+        super().__init__(name="schema_retriever", version="2.1.0")
         self.top_k = top_k
 
         self.collection          = self._init_chromadb()
         self.bm25, self.bm25_corpus = self._init_bm25()
         self.graph               = self._init_graph()
 
+        # Exact-match retrieval cache: an identical query with the same
+        # effective top_k reuses the fused table list, skipping the embedding
+        # roundtrip and the BM25/graph searches entirely.
+        self._retrieve_cache: OrderedDict[tuple[str, int], tuple[RetrievedTable, ...]] = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        # Singleton agent, concurrent /query requests — cache mutations must
+        # not interleave.
+        self._cache_lock = threading.Lock()
+
+        # Semantic cache over ChromaDB results: rows of normalized query
+        # embeddings with a parallel list of cached result tables. A cosine
+        # match above the threshold skips the HNSW search for paraphrases the
+        # exact-match cache misses.
+        self._sem_matrix: np.ndarray | None = None
+        self._sem_values: list[list[dict]] = []
+        # The matrix and the values list must stay index-aligned: a store is a
+        # two-step publish (vstack, then append) and a lookup reads both, so
+        # an unguarded interleave could index a fresh row into a stale list
+        # and return another query's tables.
+        self._sem_lock = threading.Lock()
+
+        # Warm the semantic cache from the previous process's snapshot and
+        # persist it once at exit — the hot path never touches disk.
+        self._load_semantic_cache()
+        atexit.register(self._save_semantic_cache)
+
         self.log(
             f"Hybrid retrieval initialized: "
             f"ChromaDB={'OK' if self.collection else 'SKIP'} "
@@ -78,7 +138,13 @@ class SchemaRetriever(BaseAgent):
     # INIT
     # ─────────────────────────────────────────────
 
-    def _init_chromadb(self) -> chromadb.Collection | None:
+    def _init_chromadb(self) -> "chromadb.Collection | None":
+        # chromadb pulls in a large dependency tree — imported here so that
+        # loading this module (tests, CLI tools) doesn't pay the cost.
+        import chromadb
+        from chromadb.utils import embedding_functions
+
+        self.embedding_fn = None
         try:
             openai_key = os.getenv("OPENAI_API_KEY")
             if not openai_key:
@@ -89,10 +155,16 @@ class SchemaRetriever(BaseAgent):
                 api_key=openai_key,
                 model_name="text-embedding-3-small"
             )
+            # Swap in the shared pooled client so every embed call reuses
+            # TCP+TLS connections across retriever instances.
+            embedding_fn.client = _get_embed_client(openai_key)
             collection = client.get_collection(
                 name="table_schemas",
                 embedding_function=embedding_fn
             )
+            # Kept so retrieval can embed the query once and reuse the vector
+            # for both the semantic cache and the collection query.
+            self.embedding_fn = embedding_fn
             self.log(f"ChromaDB loaded: {collection.count()} tables indexed")
             return collection
 
@@ -148,14 +220,38 @@ class SchemaRetriever(BaseAgent):
         Returns:
             Updated state with state.retrieved_tables and state.database
         """
-        chroma_results = self._retrieve_chromadb(state.query)
-        bm25_results   = self._retrieve_bm25(state.query)
-        graph_results  = self._retrieve_graph(chroma_results)
-
-        fused = self._rrf_fusion([chroma_results, bm25_results, graph_results])
         intent_cat = state.intent.get("category", "") if isinstance(state.intent, dict) else ""
         effective_top_k = self.top_k + _RECALL_BOOST if intent_cat in _RECALL_INTENTS else self.top_k
-        retrieved_tables = self._to_retrieved_tables(fused[:effective_top_k])
+
+        cache_key = (state.query.strip().lower(), effective_top_k)
+        with self._cache_lock:
+            cached = self._retrieve_cache.get(cache_key)
+            if cached is not None:
+                self._retrieve_cache.move_to_end(cache_key)
+
+        if cached is not None:
+            self.cache_hits += 1
+            retrieved_tables = list(cached)
+            self.log(f"Retrieval cache hit — reusing {len(retrieved_tables)} tables")
+        else:
+            self.cache_misses += 1
+            chroma_results = self._retrieve_chromadb(state.query)
+            bm25_results   = self._retrieve_bm25(state.query)
+            graph_results  = self._retrieve_graph(chroma_results)
+
+            fused = self._rrf_fusion([chroma_results, bm25_results, graph_results])
+            retrieved_tables = self._to_retrieved_tables(fused[:effective_top_k])
+
+            if retrieved_tables:
+                with self._cache_lock:
+                    self._retrieve_cache[cache_key] = tuple(retrieved_tables)
+                    if len(self._retrieve_cache) > self._RETRIEVE_CACHE_MAX_ENTRIES:
+                        self._retrieve_cache.popitem(last=False)
+
+            self.log(
+                f"Retrieved {len(retrieved_tables)} tables "
+                f"(chroma:{len(chroma_results)} bm25:{len(bm25_results)} graph:{len(graph_results)})"
+            )
 
         if not retrieved_tables:
             raise SchemaRetrievalError(
@@ -171,12 +267,6 @@ class SchemaRetriever(BaseAgent):
 
         state.retrieved_tables = retrieved_tables
 
-        self.log(
-            f"Retrieved {len(retrieved_tables)} tables "
-            f"(chroma:{len(chroma_results)} bm25:{len(bm25_results)} graph:{len(graph_results)}), "
-            f"database: {state.database}"
-        )
-
         return state
 
     # ─────────────────────────────────────────────
@@ -187,31 +277,162 @@ class SchemaRetriever(BaseAgent):
         if not self.collection:
             return []
         try:
-            results = self.collection.query(
-                query_texts=[query],
-                n_results=min(self.top_k * 2, 10)
-            )
-            tables = []
-            if results["ids"] and results["ids"][0]:
-                for i in range(len(results["ids"][0])):
-                    meta     = results["metadatas"][0][i]
-                    distance = results["distances"][0][i]
-                    tables.append({
-                        "id": results["ids"][0][i],
-                        "db_name": meta.get("db_name", ""),
-                        "schema_name": meta.get("schema_name", "public"),
-                        "table_name": meta.get("table_name", ""),
-                        "description": meta.get("description", ""),
-                        "columns": self._parse_list(meta.get("columns", [])),
-                        "relationships": self._parse_list(meta.get("relationships", []), sep=";"),
-                        "score": 1.0 - distance,
-                        "source": "chromadb"
-                    })
+            embedding = self._embed_query(query)
+
+            cached = self._semantic_lookup(embedding)
+            if cached is not None:
+                return list(cached)
+
+            if embedding is not None:
+                # Reuse the embedding we already computed — Chroma would
+                # otherwise re-embed the query text.
+                results = self.collection.query(
+                    query_embeddings=[embedding.tolist()],
+                    n_results=min(self.top_k * 2, 10)
+                )
+            else:
+                results = self.collection.query(
+                    query_texts=[query],
+                    n_results=min(self.top_k * 2, 10)
+                )
+            tables = self._parse_chroma_rows(results, 0)
+            self._semantic_store(embedding, tables)
             return tables
         except Exception as e:
             self.log(f"ChromaDB retrieval failed: {e}", level="warning")
             return []
 
+    def retrieve_batch(self, queries: list[str], top_k: int | None = None) -> list[list[RetrievedTable]]:
+        """
+        Retrieve semantic matches for several queries in one ChromaDB call.
+
+        Chroma batches the embedding request and runs the HNSW searches in a
+        single call, so K queries cost one embedding roundtrip instead of K.
+        ChromaDB-only (no BM25/graph fusion) — intended for bulk evaluation
+        runs, not the per-request pipeline path.
+        """
+        if not queries:
+            return []
+        if not self.collection:
+            return [[] for _ in queries]
+
+        k = top_k or self.top_k
+        try:
+            results = self.collection.query(
+                query_texts=list(queries),
+                n_results=min(k, 10)
+            )
+        except Exception as e:
+            self.log(f"Batch ChromaDB retrieval failed: {e}", level="warning")
+            return [[] for _ in queries]
+
+        return [
+            self._to_retrieved_tables(self._parse_chroma_rows(results, qi))
+            for qi in range(len(queries))
+        ]
+
+    def _parse_chroma_rows(self, results: dict, qi: int) -> list[dict]:
+        """Build table dicts from one query's row of a ChromaDB result set."""
+        if not results["ids"] or qi >= len(results["ids"]):
+            return []
+
+        ids, metas = results["ids"][qi], results["metadatas"][qi]
+        # One vectorized distance→similarity conversion for the whole row
+        # instead of a Python-level float subtraction per table.
+        sims = 1.0 - np.asarray(results["distances"][qi], dtype=np.float64)
+        parse_list = self._parse_list  # local bind — skips attribute lookup per row
+        return [
+            {
+                "id": table_id,
+                "db_name": meta.get("db_name", ""),
+                "schema_name": meta.get("schema_name", "public"),
+                "table_name": meta.get("table_name", ""),
+                "description": meta.get("description", ""),
+                "columns": parse_list(meta.get("columns", [])),
+                "relationships": parse_list(meta.get("relationships", []), sep=";"),
+                "score": float(sims[i]),
+                "source": "chromadb"
+            }
+            for i, (table_id, meta) in enumerate(zip(ids, metas))
+        ]
+
+    def _embed_query(self, query: str) -> np.ndarray | None:
+        """Embed and L2-normalize the query; None when embedding is unavailable."""
+        if self.embedding_fn is None:
+            return None
+        try:
+            vec = np.asarray(self.embedding_fn([query])[0], dtype=np.float32)
+            norm = float(np.linalg.norm(vec))
+            return vec / norm if norm > 0.0 else None
+        except Exception as e:
+            self.log(f"Query embedding failed: {e}", level="warning")
+            return None
+
+    def _semantic_lookup(self, embedding: np.ndarray | None) -> list[dict] | None:
+        """Return cached tables whose query embedding is near-identical, if any."""
+        if embedding is None:
+            return None
+
+        with self._sem_lock:
+            if self._sem_matrix is None:
+                return None
+            sims = self._sem_matrix @ embedding
+            best = int(np.argmax(sims))
+            similarity = float(sims[best])
+            tables = self._sem_values[best] if similarity >= _SEMANTIC_CACHE_THRESHOLD else None
+
+        if tables is not None:
+            self.log(f"Semantic cache hit (similarity={similarity:.3f})")
+        return tables
+
+    def _semantic_store(self, embedding: np.ndarray | None, tables: list[dict]) -> None:
+        """Append a (query embedding, result) pair, evicting the oldest at capacity."""
+        if embedding is None or not tables:
+            return
+
+        with self._sem_lock:
+            if self._sem_matrix is None:
+                self._sem_matrix = embedding[None, :]
+            else:
+                self._sem_matrix = np.vstack([self._sem_matrix, embedding])
+            self._sem_values.append(tables)
+
+            if len(self._sem_values) > _SEMANTIC_CACHE_MAX_ENTRIES:
+                self._sem_matrix = self._sem_matrix[1:]
+                self._sem_values.pop(0)
+
+    def _load_semantic_cache(self) -> None:
+        """Restore the semantic cache snapshot from a previous process, if fresh."""
+        path = Config.SEMANTIC_CACHE_FILE
+        try:
+            if not os.path.exists(path):
+                return
+            if time.time() - os.path.getmtime(path) > Config.SEMANTIC_CACHE_TTL_SECONDS:
+                self.log("Semantic cache snapshot expired, starting cold")
+                return
+            with open(path, "rb") as f:
+                snapshot = pickle.load(f)  # nosec B301 — file is written by _save_semantic_cache below
+            if snapshot.get("values"):
+                self._sem_matrix = snapshot["matrix"]
+                self._sem_values = snapshot["values"]
+                self.log(f"Semantic cache warmed from disk: {len(self._sem_values)} entries")
+        except Exception as e:
+            self.log(f"Semantic cache load failed: {e}", level="warning")
+
+    def _save_semantic_cache(self) -> None:
+        """Snapshot the semantic cache to disk (registered via atexit)."""
+        if not self._sem_values:
+            return
+        path = Config.SEMANTIC_CACHE_FILE
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with self._sem_lock:
+                snapshot = {"matrix": self._sem_matrix, "values": list(self._sem_values)}
+            with open(path, "wb") as f:
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            self.log(f"Semantic cache save failed: {e}", level="warning")
+
     def _retrieve_bm25(self, query: str) -> list[dict]:
         if not self.bm25 or not self.bm25_corpus:
             return []
@@ -358,6 +579,14 @@ class SchemaRetriever(BaseAgent):
             return data
         return [x.strip() for x in str(data).split(sep) if x.strip()]
 
+    def cache_stats(self) -> dict[str, int]:
+        """Return hit/miss counters for the exact-match retrieval cache."""
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "entries": len(self._retrieve_cache),
+        }
+
     def get_all_tables(self) -> list[str]:
         try:
             all_data = self.collection.get()
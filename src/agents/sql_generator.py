@@ -28,10 +28,19 @@ Example:
 
 import json
 import re
+import threading
+from collections import OrderedDict
 from datetime import date
 
 import yaml
 
+try:
+    # libyaml C parser — an order of magnitude faster than the pure-Python
+    # loader for the startup examples file; same safe-loading semantics.
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover — wheel built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
 from src.core.config import Config
 from src.core.llm_base_agent import LLMBaseAgent
 from src.models.agent_state import AgentState
@@ -47,19 +56,20 @@ _PARTNER_COUNT    = len(get_partner_canonical_list())
 # Maximum rows per previous step shown in context to avoid prompt overflow
 _PREV_STEP_ROW_PREVIEW = 5
 
-# LLM prompt template — plain string so bandit B608 is not triggered on the
-# definition. Variables use .format() placeholders; the caller adds # nosec B608
-# on the single-line .format() call (not executed as SQL; this is an AI prompt).
-_PROMPT_TEMPLATE = """You are a senior PostgreSQL data engineer for Telkomsel's financial payment database.
-Convert natural language questions into correct PostgreSQL SQL queries.
+# Max memoized schema-context blocks — dashboards hit the same few table
+# sets repeatedly, so the working set is tiny.
+_SCHEMA_CTX_CACHE_MAX_ENTRIES = 64
 
-DATE RULES:
-- TODAY IS: {today}. ALL DATA IS YEAR {data_year} — NEVER use {prev_years}.
-- LATEST AVAILABLE DATA DATE: {data_end_date_str}. Never generate dates beyond this.
-- "bulan ini" → {current_month_start} to {today}. Month name without a year → assume {data_year}.
-- Named month (e.g. "bulan Juni", "Juni 2026", "Mei 2026"): ALWAYS use the EXACT calendar range
-  of that month. "Juni" → '{data_year}-06-01' to '{data_year}-06-30'. "Mei" → '{data_year}-05-01' to '{data_year}-05-31'.
-  NEVER substitute a different month than the one the user explicitly requested.
+# Precompiled response-cleanup patterns — a single alternation strips both
+# ```sql and bare ``` fences in one pass over the LLM response.
+_MD_FENCE_RE = re.compile(r'```sql\s*|```\s*')
+_SQL_START_RE = re.compile(r'(WITH\s+|SELECT\s+)', re.IGNORECASE)
+
+# Static prompt prefix — role, domain notes, and rules never change between
+# calls, so domain constants are interpolated exactly once at import. Plain
+# string so bandit B608 is not triggered on the definition.
+_SYSTEM_PROMPT = """You are a senior PostgreSQL data engineer for Telkomsel's financial payment database.
+Convert natural language questions into correct PostgreSQL SQL queries.
 
 DOMAIN NOTES:
 - Linkaja has multiple name variants — always include ALL: ({linkaja_variants})
@@ -102,12 +112,27 @@ SQL STYLE RULES:
 12. Use snake_case column names exactly as provided.
 13. Prefer CTE (WITH ...) for complex queries.
 14. Do not generate INSERT, UPDATE, DELETE, or DROP statements.
+""".format(  # nosec B608 — builds an LLM prompt, not executed SQL
+    linkaja_variants=_LINKAJA_VARIANTS,
+    partner_count=_PARTNER_COUNT,
+    partner_list=_PARTNER_LIST,
+)
+
+# Per-call prompt suffix — everything that depends on the current date or
+# pipeline state. Variables use .format() placeholders; the caller adds
+# # nosec B608 on the single-line .format() call (an AI prompt, not SQL).
+_USER_TEMPLATE = """DATE RULES:
+- TODAY IS: {today}. ALL DATA IS YEAR {data_year} — NEVER use {prev_years}.
+- LATEST AVAILABLE DATA DATE: {data_end_date_str}. Never generate dates beyond this.
+- "bulan ini" → {current_month_start} to {today}. Month name without a year → assume {data_year}.
+- Named month (e.g. "bulan Juni", "Juni 2026", "Mei 2026"): ALWAYS use the EXACT calendar range
+  of that month. "Juni" → '{data_year}-06-01' to '{data_year}-06-30'. "Mei" → '{data_year}-05-01' to '{data_year}-05-31'.
+  NEVER substitute a different month than the one the user explicitly requested.
 
 {history_block}{intent_hint}
 {error_block}
 {schema_context}
 
-{examples_context}
 {prev_steps_block}
 Generate SQL for the following question.
 
@@ -145,6 +170,15 @@ class SQLGenerator(LLMBaseAgent):
     def __init__(self, examples_path: str = Config.EXAMPLES_PATH) -> None:
         super().__init__(name="sql_generator", version="1.0.0")
         self.examples = self._load_examples(examples_path)
+        # System rules and few-shot examples never change between calls —
+        # render the prefix once instead of rebuilding it per generation.
+        self._static_prefix = _SYSTEM_PROMPT + "\n" + self._render_examples()
+        # Built schema-context blocks keyed by table signature — repeated
+        # queries over the same table set skip the string rebuild (LRU).
+        self._schema_ctx_cache: OrderedDict[tuple, str] = OrderedDict()
+        # Singleton agent, concurrent /query requests — cache mutations must
+        # not interleave.
+        self._cache_lock = threading.Lock()
         self.log(f"Few-shot examples loaded: {len(self.examples)}")
 
     def execute(self, state: AgentState) -> AgentState:
@@ -171,7 +205,12 @@ class SQLGenerator(LLMBaseAgent):
         max_attempts = 3
 
         for attempt in range(max_attempts):
-            sql = self._call_llm(prompt, max_tokens=1000, temperature=0)
+            # Static prefix goes through the system channel so Anthropic
+            # caches it across calls (see LLMBaseAgent._call_anthropic);
+            # only the dynamic prompt is re-prefixed per request.
+            sql = self._call_llm(
+                prompt, max_tokens=1000, temperature=0, system=self._static_prefix
+            )
             self._record_token_usage(state, model=self.model, iteration=attempt)
             sql = self._clean_sql(sql)
             sql = self._apply_partner_group_fix(sql)
@@ -210,7 +249,11 @@ class SQLGenerator(LLMBaseAgent):
         )
 
     def _build_prompt(self, state: AgentState) -> str:
-        """Build SQL generation prompt using intent strategy and table schemas."""
+        """Build the dynamic portion of the SQL prompt (dates, intent, schemas).
+
+        The static system rules + few-shot examples travel separately as
+        ``self._static_prefix`` via ``_call_llm(system=...)``.
+        """
         intent_hint = ""
         if state.intent:
             intent_hint = f"""
@@ -218,22 +261,7 @@ QUERY STRATEGY: {state.intent.get('sql_strategy', '')}
 QUERY TYPE: {state.intent.get('category', '')}
 """
 
-        schema_context = "AVAILABLE TABLES:\n\n"
-        for table in state.evaluated_tables:
-            schema_context += f"Table: {table.table_name} (in {table.db_name})\n"
-            schema_context += f"Description: {table.description}\n"
-            schema_context += f"Columns: {', '.join(table.columns)}\n"
-            if table.relationships:
-                schema_context += "Relationships:\n"
-                for rel in table.relationships:
-                    schema_context += f"  - {rel}\n"
-            schema_context += "\n"
-
-        examples_context = "EXAMPLE QUERIES:\n\n"
-        for i, example in enumerate(self.examples[:7], 1):
-            examples_context += f"Example {i}:\n"
-            examples_context += f"Question: {example['question']}\n"
-            examples_context += f"SQL:\n{example['sql']}\n\n"
+        schema_context = self._schema_context(state.evaluated_tables)
 
         prev_steps_block = self._build_prev_steps_block(state)
         history_block = self._build_history_block(state.conversation_history)
@@ -245,14 +273,52 @@ QUERY TYPE: {state.intent.get('category', '')}
         prev_years = ", ".join(str(y) for y in range(data_year - 3, data_year))
         data_end_date_str = state.data_end_date.isoformat() if state.data_end_date else f"{data_year}-12-31"
 
-        return _PROMPT_TEMPLATE.format(  # nosec B608 — builds an LLM prompt, not executed SQL
+        return _USER_TEMPLATE.format(  # nosec B608 — builds an LLM prompt, not executed SQL
             today=today, data_year=data_year, prev_years=prev_years,
             data_end_date_str=data_end_date_str, current_month_start=current_month_start,
-            linkaja_variants=_LINKAJA_VARIANTS, partner_count=_PARTNER_COUNT, partner_list=_PARTNER_LIST,
             history_block=history_block, intent_hint=intent_hint, error_block=error_block,
-            schema_context=schema_context, examples_context=examples_context,
-            prev_steps_block=prev_steps_block, query=state.query,
+            schema_context=schema_context, prev_steps_block=prev_steps_block, query=state.query,
+        )
+
+    def _schema_context(self, tables: list) -> str:
+        """Return the AVAILABLE TABLES block, memoized per table signature."""
+        key = tuple(
+            (t.db_name, t.table_name, tuple(t.columns), tuple(t.relationships))
+            for t in tables
         )
+        with self._cache_lock:
+            cached = self._schema_ctx_cache.get(key)
+            if cached is not None:
+                self._schema_ctx_cache.move_to_end(key)
+                return cached
+
+        # Accumulate fragments and join once — linear in total prompt size
+        # regardless of table/relationship count.
+        parts = ["AVAILABLE TABLES:\n\n"]
+        for table in tables:
+            parts.append(
+                f"Table: {table.table_name} (in {table.db_name})\n"
+                f"Description: {table.description}\n"
+                f"Columns: {', '.join(table.columns)}\n"
+            )
+            if table.relationships:
+                parts.append("Relationships:\n")
+                parts.extend(f"  - {rel}\n" for rel in table.relationships)
+            parts.append("\n")
+        context = "".join(parts)
+
+        with self._cache_lock:
+            self._schema_ctx_cache[key] = context
+            if len(self._schema_ctx_cache) > _SCHEMA_CTX_CACHE_MAX_ENTRIES:
+                self._schema_ctx_cache.popitem(last=False)
+        return context
+
+    def _render_examples(self) -> str:
+        """Render the few-shot examples block (called once at init)."""
+        parts = ["EXAMPLE QUERIES:\n\n"]
+        for i, example in enumerate(self.examples[:7], 1):
+            parts.append(f"Example {i}:\nQuestion: {example['question']}\nSQL:\n{example['sql']}\n\n")
+        return "".join(parts)
 
     def _build_error_block(self, sql_error: str | None, failed_sql: str | None) -> str:
         """Return a correction block when a previous SQL attempt failed at execution."""
@@ -304,10 +370,9 @@ QUERY TYPE: {state.intent.get('category', '')}
 
     def _clean_sql(self, sql: str) -> str:
         """Remove markdown and extract only SQL from response."""
-        sql = re.sub(r'```sql\s*', '', sql)
-        sql = re.sub(r'```\s*', '', sql)
+        sql = _MD_FENCE_RE.sub('', sql)
 
-        match = re.search(r'(WITH\s+|SELECT\s+)', sql, re.IGNORECASE)
+        match = _SQL_START_RE.search(sql)
         if match:
             sql = sql[match.start():]
 
@@ -384,7 +449,7 @@ QUERY TYPE: {state.intent.get('category', '')}
         """Load few-shot examples from YAML."""
         try:
             with open(path, encoding="utf-8") as f:
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=_YamlLoader)
                 return config.get('examples', [])
         except FileNotFoundError:
             self.log(f"Examples file not found: {path} — using built-in domain defaults", level="warning")
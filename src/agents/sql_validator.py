@@ -24,15 +24,75 @@ Example:
     SELECT COUNT(*) FROM customers;
 """
 
+import functools
 import re
+import threading
+import time
+from collections import OrderedDict
 
 import sqlparse
+from sqlparse import tokens as T
 
 from src.core.config import Config
 from src.core.llm_base_agent import LLMBaseAgent
 from src.models.agent_state import AgentState
 from src.utils.exceptions import SQLValidationError
 
+# Strips markdown code fences from auto-fix output in one pass.
+_FENCE_RE = re.compile(r'```(?:sql)?\s*')
+
+# Tokens that follow FROM/JOIN without being table names (subqueries, functions).
+_TABLE_SKIP_WORDS = frozenset({'select', 'where', 'extract', 'current_date', 'lateral', 'unnest'})
+
+# Max cached AI logic-validation results (LRU eviction).
+_AI_CACHE_MAX_ENTRIES = 128
+
+# Auto-fix result cache: size cap (LRU eviction) and entry TTL. The short
+# TTL bounds staleness if the serving model changes between calls.
+_FIX_CACHE_MAX_ENTRIES = 1024
+_FIX_CACHE_TTL_SECONDS = 300
+
+# Aggregate functions tolerated by the rule-based layer-4 skip.
+_AGGREGATE_FUNCS = frozenset({'sum', 'count', 'avg', 'min', 'max'})
+
+# A single-table query with more aggregates than this still goes to the LLM.
+_TRIVIAL_MAX_AGGREGATES = 3
+
+# Static rubrics sent via _call_llm(system=...) so providers that support
+# prompt caching reuse the prefix across calls; only the user question and
+# SQL vary per request.
+_LOGIC_SYSTEM_PROMPT = """You are a SQL validator. Check if the SQL correctly answers the user's question.
+
+Respond in this EXACT format:
+VALID: [YES or NO]
+ERRORS: [logic errors, one per line, or "None"]
+WARNINGS: [warnings, one per line, or "None"]"""
+
+_LOGIC_USER_TEMPLATE = """USER QUESTION: "{query}"
+
+SQL:
+{sql}
+
+Your response:"""
+
+_AUTO_FIX_SYSTEM_PROMPT = """You are a SQL fixer. Fix the errors in the SQL query.
+
+Return ONLY the corrected SQL, no explanation."""
+
+_AUTO_FIX_USER_TEMPLATE = """USER QUESTION: "{query}"
+
+CURRENT SQL (with errors):
+{sql}
+
+ERRORS:
+{errors}
+
+Corrected SQL:"""
+
+# Max cached deterministic (syntax+security+tables) verdicts — entries are a
+# few error strings each, so this costs at most a few hundred KB.
+_STRUCTURAL_CACHE_SIZE = 4096
+
 
 class SQLValidator(LLMBaseAgent):
     """
@@ -60,6 +120,40 @@ class SQLValidator(LLMBaseAgent):
         self.allowed_tables = Config.ALLOWED_TABLES
         self.dangerous_keywords = Config.DANGEROUS_KEYWORDS
 
+        # One case-insensitive alternation compiled once — a single C-level
+        # scan instead of one pass per keyword. Word boundaries keep column
+        # names like customer_created_at from matching CREATE.
+        self._danger_re = re.compile(
+            r'\b(' + '|'.join(sorted(self.dangerous_keywords)) + r')\b',
+            re.IGNORECASE,
+        )
+        self._comment_re = re.compile(r'--|/\*|\*/')
+
+        # AI logic-validation cache keyed by normalized (sql, query) — re-runs
+        # and cosmetic whitespace/case rewrites skip the LLM roundtrip.
+        self._ai_cache: OrderedDict[tuple[str, str], tuple[tuple, tuple]] = OrderedDict()
+
+        # Auto-fix cache keyed by (sql, errors, query) — identical broken SQL
+        # (retry storms, test suites, UI re-submits) skips the fix roundtrip.
+        self._fix_cache: OrderedDict[tuple[str, tuple[str, ...], str], tuple[str, float]] = OrderedDict()
+
+        # Guards both LLM caches: the agent is a process-wide singleton and
+        # /query requests run concurrently, so get/move_to_end/popitem pairs
+        # must not interleave. (_structural_cached needs no lock — CPython's
+        # lru_cache is thread-safe.)
+        self._cache_lock = threading.Lock()
+
+        # Fast model for layer 4 (a yes/no sanity check, so a small model is
+        # enough) — None means "use the configured model". The configured
+        # (stronger) model is kept for auto-fix.
+        self._fast_model = self._fast_model_for_provider()
+
+        # Deterministic-layer cache, bound per instance so entries die with
+        # the validator instead of being retained by a class-level decorator.
+        self._structural_cached = functools.lru_cache(maxsize=_STRUCTURAL_CACHE_SIZE)(
+            self._run_structural_layers
+        )
+
         self.log(
             f"AI validation: {'enabled' if self.enable_ai_validation else 'disabled'}, "
             f"max_retries: {max_retries}"
@@ -149,21 +243,30 @@ class SQLValidator(LLMBaseAgent):
         )
 
     def _validate_structural(self, sql: str) -> list[str]:
-        """Run layers 1-3 only (deterministic): syntax, security, table whitelist."""
-        errors = self._validate_syntax(sql)
-        if errors:
-            return errors
-        errors = self._validate_security(sql)
-        if errors:
-            return errors
-        return self._validate_tables(sql)
+        """Run layers 1-3 only (deterministic): syntax, security, table whitelist.
+
+        Results are cached on whitespace-collapsed SQL, so re-submits and
+        formatting variants skip the parse and scan passes entirely. Case is
+        preserved in the key to keep error messages matching the input.
+        """
+        return list(self._structural_cached(' '.join(sql.split())))
+
+    def _run_structural_layers(self, sql: str) -> tuple[str, ...]:
+        """Uncached body behind _structural_cached — returns a hashable tuple."""
+        statement, errors = self._parse_sql(sql)
+        if not errors:
+            errors = self._validate_security(sql)
+        if not errors:
+            errors = self._validate_tables(statement)
+        return tuple(errors)
 
     def _validate(self, sql: str, query: str = "", state: AgentState | None = None) -> tuple[list[str], list[str]]:
         """Run all validation layers, return (errors, warnings)."""
         errors: list[str] = []
         warnings: list[str] = []
 
-        errors.extend(self._validate_syntax(sql))
+        statement, syntax_errors = self._parse_sql(sql)
+        errors.extend(syntax_errors)
         if errors:
             return errors, warnings
 
@@ -171,7 +274,7 @@ class SQLValidator(LLMBaseAgent):
         if errors:
             return errors, warnings
 
-        errors.extend(self._validate_tables(sql))
+        errors.extend(self._validate_tables(statement))
         if errors:
             return errors, warnings
 
@@ -182,89 +285,175 @@ class SQLValidator(LLMBaseAgent):
 
         return errors, warnings
 
-    def _validate_syntax(self, sql: str) -> list[str]:
-        """Layer 1: Syntax validation using sqlparse."""
+    def _parse_sql(self, sql: str) -> tuple[sqlparse.sql.Statement | None, list[str]]:
+        """Layer 1: Parse once with sqlparse; the statement feeds layer 3.
+
+        Returns (statement, errors). On syntax failure the statement is None
+        and errors is non-empty.
+        """
         try:
             parsed = sqlparse.parse(sql)
             if not parsed or not str(parsed[0]).strip():
-                return ["SYNTAX: Empty or invalid SQL"]
+                return None, ["SYNTAX: Empty or invalid SQL"]
         except Exception as e:
-            return [f"SYNTAX: Parse error - {e}"]
-        return []
+            return None, [f"SYNTAX: Parse error - {e}"]
+        return parsed[0], []
 
     def _validate_security(self, sql: str) -> list[str]:
         """Layer 2: Security validation — blocks dangerous keywords and multi-statements."""
         errors: list[str] = []
-        sql_upper = sql.upper()
 
-        for keyword in self.dangerous_keywords:
-            # Use word boundary to avoid matching column names (e.g. customer_created_at ≠ CREATE)
-            pattern = r'\b' + keyword + r'\b'
-            if re.search(pattern, sql_upper):
-                errors.append(f"SECURITY: Dangerous keyword '{keyword}' not allowed")
+        # Single alternation pass; dict.fromkeys dedupes repeated keywords
+        # while preserving order of first appearance.
+        found = dict.fromkeys(m.group(1).upper() for m in self._danger_re.finditer(sql))
+        for keyword in found:
+            errors.append(f"SECURITY: Dangerous keyword '{keyword}' not allowed")
 
-        if '--' in sql or '/*' in sql or '*/' in sql:
+        if self._comment_re.search(sql):
             errors.append("SECURITY: SQL comments not allowed")
 
         if ';' in sql.strip().rstrip(';'):
             errors.append("SECURITY: Multiple statements not allowed")
 
-        if not (sql_upper.strip().startswith('SELECT') or sql_upper.strip().startswith('WITH')):
+        # Only the statement head needs case folding — not a full-SQL copy.
+        head = sql.lstrip()[:6].upper()
+        if not (head.startswith('SELECT') or head.startswith('WITH')):
             errors.append("SECURITY: Only SELECT queries are allowed")
 
         return errors
 
-    def _validate_tables(self, sql: str) -> list[str]:
-        """Layer 3: Table whitelist validation."""
+    def _validate_tables(self, statement: sqlparse.sql.Statement | None) -> list[str]:
+        """Layer 3: Table whitelist validation over the parsed token stream.
+
+        Walks the flattened tokens from layer 1's parse instead of re-scanning
+        the raw SQL: a Name right after FROM/JOIN is a table reference, and a
+        Name followed by AS + ( is a CTE definition. Subqueries and functions
+        put Punctuation/Builtin tokens after FROM, so they skip naturally.
+        """
         errors: list[str] = []
+        if statement is None:
+            return errors
 
-        cte_names = set(re.findall(
-            r'\bWITH\s+(\w+)\s+AS\s*\(',
-            sql,
-            re.IGNORECASE
-        ))
+        cte_names: set[str] = set()
+        expect_table = False
+        pending_cte: str | None = None
+        pending_as = False
 
-        matches = re.findall(
-            r'\b(?:FROM|JOIN)\s+([a-zA-Z_][a-zA-Z0-9_]*)',
-            sql,
-            re.IGNORECASE
-        )
+        for token in statement.flatten():
+            if token.is_whitespace:
+                continue
 
-        skip_words = {'select', 'where', 'extract', 'current_date', 'lateral', 'unnest'}
+            if token.ttype in T.Keyword:
+                upper = token.value.upper()
+                if upper == 'FROM' or upper.endswith('JOIN'):
+                    expect_table = True
+                elif upper == 'AS' and pending_cte is not None:
+                    pending_as = True
+                    continue
+                else:
+                    expect_table = False
+                pending_cte = None
+                pending_as = False
+                continue
 
-        for table_name in matches:
-            if table_name.lower() in skip_words:
+            if expect_table and token.ttype in T.Name:
+                expect_table = False
+                name = token.value
+                lower = name.lower()
+                if lower in _TABLE_SKIP_WORDS or lower in cte_names:
+                    continue
+                if len(name) > 1 and lower not in self.allowed_tables:
+                    errors.append(f"TABLE: Unknown table '{name}'")
                 continue
-            if table_name.lower() in {c.lower() for c in cte_names}:
+
+            if token.ttype in T.Name:
+                # Candidate CTE name — confirmed if followed by AS then (.
+                pending_cte = token.value.lower()
+                pending_as = False
+                expect_table = False
                 continue
-            if len(table_name) > 1 and table_name.lower() not in self.allowed_tables:
-                errors.append(f"TABLE: Unknown table '{table_name}'")
+
+            if pending_as and token.ttype in T.Punctuation and token.value == '(':
+                cte_names.add(pending_cte)  # type: ignore[arg-type]
+
+            pending_cte = None
+            pending_as = False
+            expect_table = False
 
         return errors
 
+    def _is_trivially_valid(self, sql: str) -> bool:
+        """Rule-based layer-4 skip: single table, no joins, no subqueries,
+        at most a few plain aggregates. Such queries cannot hide the logic
+        mistakes the AI layer exists to catch, so the LLM call is pure cost.
+        """
+        tables = 0
+        aggregates = 0
+        expect_table = False
+        after_open_paren = False
+        in_from_list = False
+
+        for token in sqlparse.parse(sql)[0].flatten():
+            if token.is_whitespace:
+                continue
+
+            if token.ttype in T.DML and after_open_paren:
+                return False  # subquery
+
+            if token.ttype in T.Keyword:
+                upper = token.value.upper()
+                if upper.endswith('JOIN'):
+                    return False
+                expect_table = upper == 'FROM'
+                in_from_list = expect_table
+                after_open_paren = False
+                continue
+
+            if token.ttype in T.Punctuation and token.value == ',' and in_from_list:
+                return False  # implicit comma join
+
+            if expect_table and token.ttype in T.Name:
+                if token.value.lower() not in _TABLE_SKIP_WORDS:
+                    tables += 1
+                    if tables > 1:
+                        return False
+            elif token.ttype in T.Name and token.value.lower() in _AGGREGATE_FUNCS:
+                aggregates += 1
+                if aggregates > _TRIVIAL_MAX_AGGREGATES:
+                    return False
+
+            expect_table = False
+            after_open_paren = token.ttype in T.Punctuation and token.value == '('
+
+        return True
+
     def _validate_logic_ai(self, sql: str, query: str, state: AgentState | None = None) -> tuple[list[str], list[str]]:
         """Layer 4: AI logic validation using LLM."""
         if 'EXTRACT(' in sql.upper() or 'DATE_TRUNC' in sql.upper():
             return [], []
 
-        prompt = f"""You are a SQL validator. Check if this SQL correctly answers the user's question.
-
-USER QUESTION: "{query}"
-
-SQL:
-{sql}
-
-Respond in this EXACT format:
-VALID: [YES or NO]
-ERRORS: [logic errors, one per line, or "None"]
-WARNINGS: [warnings, one per line, or "None"]
+        cache_key = (' '.join(sql.split()).lower(), query.strip().lower())
+        with self._cache_lock:
+            cached = self._ai_cache.get(cache_key)
+            if cached is not None:
+                self._ai_cache.move_to_end(cache_key)
+        if cached is not None:
+            self.log("AI validation cache hit")
+            return list(cached[0]), list(cached[1])
+
+        if self._is_trivially_valid(sql):
+            self.log("AI validation skipped: trivial single-table query")
+            return [], []
 
-Your response:"""
+        prompt = _LOGIC_USER_TEMPLATE.format(query=query, sql=sql)
 
         try:
-            response = self._call_llm(prompt, max_tokens=500, temperature=0)
+            response = self._call_llm(
+                prompt, max_tokens=500, temperature=0,
+                model=self._fast_model, system=_LOGIC_SYSTEM_PROMPT,
+            )
             if state is not None:
-                self._record_token_usage(state, model=self.model)
+                self._record_token_usage(state, model=self._fast_model or self.model)
             errors: list[str] = []
             warnings: list[str] = []
             current_section: str | None = None
@@ -289,6 +478,13 @@ Your response:"""
                         else:
                             warnings.append(f"LOGIC: {content}")
 
+            # Cache successful verdicts only — transient API failures below
+            # must stay retryable.
+            with self._cache_lock:
+                self._ai_cache[cache_key] = (tuple(errors), tuple(warnings))
+                if len(self._ai_cache) > _AI_CACHE_MAX_ENTRIES:
+                    self._ai_cache.popitem(last=False)
+
             return errors, warnings
 
         except Exception as e:
@@ -297,27 +493,32 @@ Your response:"""
 
     def _auto_fix(self, sql: str, errors: list[str], query: str, state: AgentState | None = None) -> str:
         """Auto-fix SQL using LLM."""
-        prompt = f"""You are a SQL fixer. Fix the errors in this SQL query.
-
-USER QUESTION: "{query}"
-
-CURRENT SQL (with errors):
-{sql}
-
-ERRORS:
-{chr(10).join(errors)}
-
-Return ONLY the corrected SQL, no explanation.
-
-Corrected SQL:"""
+        cache_key = (' '.join(sql.split()).lower(), tuple(sorted(errors)), query.strip().lower())
+        with self._cache_lock:
+            cached = self._fix_cache.get(cache_key)
+            fresh = cached is not None and time.time() - cached[1] < _FIX_CACHE_TTL_SECONDS
+            if fresh:
+                self._fix_cache.move_to_end(cache_key)
+        if fresh:
+            self.log("Auto-fix cache hit")
+            return cached[0]
+
+        prompt = _AUTO_FIX_USER_TEMPLATE.format(query=query, sql=sql, errors='\n'.join(errors))
 
         try:
-            fixed = self._call_llm(prompt, max_tokens=800, temperature=0)
+            fixed = self._call_llm(prompt, max_tokens=800, temperature=0, system=_AUTO_FIX_SYSTEM_PROMPT)
             if state is not None:
                 self._record_token_usage(state, model=self.model)
-            fixed = re.sub(r'```sql\s*', '', fixed)
-            fixed = re.sub(r'```\s*', '', fixed)
-            return fixed.strip()
+            fixed = _FENCE_RE.sub('', fixed).strip()
+
+            # Cache successful fixes only; failures below must stay retryable.
+            if fixed:
+                with self._cache_lock:
+                    self._fix_cache[cache_key] = (fixed, time.time())
+                    if len(self._fix_cache) > _FIX_CACHE_MAX_ENTRIES:
+                        self._fix_cache.popitem(last=False)
+
+            return fixed
         except Exception as e:
             self.log(f"Auto-fix failed: {e}", level="error")
             return ""
@@ -17,6 +17,7 @@ Example:
     ...         return state
 """
 
+import logging
 import time
 from abc import ABC, abstractmethod
 from datetime import datetime
@@ -152,8 +153,10 @@ class BaseAgent(ABC):
             message: Log message
             level: Log level ('debug', 'info', 'warning', 'error')
         """
-        log_method = getattr(self.logger, level.lower(), self.logger.info)
-        log_method(f"[{self.name}] {message}")
+        level_no = getattr(logging, level.upper(), logging.INFO)
+        if not self.logger.isEnabledFor(level_no):
+            return  # skip prefix formatting and handler dispatch entirely
+        self.logger.log(level_no, "[%s] %s", self.name, message)
 
     def _update_metrics(self, success: bool, execution_time: float) -> None:
         """Update agent performance metrics."""
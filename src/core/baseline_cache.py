@@ -11,6 +11,8 @@ from typing import Any
 from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
+from src.utils.formatting import fmt_rev, fmt_trx
+
 
 class BaselineCache:
     """
@@ -184,18 +186,6 @@ class BaselineCache:
                 "rev_std":  float(row[4] or 0),
             }
 
-    @staticmethod
-    def _fmt_trx(n: float) -> str:
-        if n >= 1_000_000:
-            return f"{n/1_000_000:.1f}jt"
-        if n >= 1_000:
-            return f"{n/1_000:.1f}rb"
-        return str(int(n))
-
-    @staticmethod
-    def _fmt_rev(n: float) -> str:
-        if n >= 1_000_000_000:
-            return f"{n/1_000_000_000:.1f} miliar"
-        if n >= 1_000_000:
-            return f"{n/1_000_000:.1f} juta"
-        return f"{int(n):,}"
+    # Shared scale logic lives in src.utils.formatting
+    _fmt_trx = staticmethod(fmt_trx)
+    _fmt_rev = staticmethod(fmt_rev)
@@ -41,10 +41,28 @@ class Config:
     GRAPH_INDEX_FILE = os.getenv("GRAPH_INDEX_FILE") or str(_ROOT / "data" / "schema_graph.json")
     TOP_K_RETRIEVAL = int(os.getenv("TOP_K_RETRIEVAL", "5"))
 
+    # Disk snapshot of the semantic retrieval cache so a restarted process
+    # starts warm instead of re-paying embedding calls. Stale snapshots are
+    # ignored after the TTL (default 24h).
+    SEMANTIC_CACHE_FILE = os.getenv("SEMANTIC_CACHE_FILE") or str(_ROOT / "data" / "semantic_cache.pkl")
+    SEMANTIC_CACHE_TTL_SECONDS = int(os.getenv("SEMANTIC_CACHE_TTL_SECONDS", "86400"))
+
     # RRF (Reciprocal Rank Fusion) constant.
     # Higher value = rank differences matter less. Standard value is 60.
     RRF_K = int(os.getenv("RRF_K", "60"))
 
+    # ── Retrieval Evaluator ───────────────────────────────────────
+    # Score-based short-circuit: skip the LLM when the top table clearly
+    # dominates, or when all scores cluster so tightly that ranking is moot.
+    # The retriever emits RRF-fused scores (bounded by n_retrievers/(RRF_K+1),
+    # not cosine [0,1]), so these are relative thresholds: HIGH = fraction of
+    # the max attainable fused score the top table must reach, LOW = fraction
+    # of the top score the runner-up must stay under, EPS = max score spread
+    # relative to the top for the "clustered" branch.
+    EVAL_SHORT_CIRCUIT_HIGH = float(os.getenv("EVAL_SHORT_CIRCUIT_HIGH", "0.90"))
+    EVAL_SHORT_CIRCUIT_LOW = float(os.getenv("EVAL_SHORT_CIRCUIT_LOW", "0.55"))
+    EVAL_SCORE_CLUSTER_EPS = float(os.getenv("EVAL_SCORE_CLUSTER_EPS", "0.05"))
+
     # ── SQL Validator ─────────────────────────────────────────────
     ENABLE_AI_VALIDATION = os.getenv("ENABLE_AI_VALIDATION", "false").lower() == "true"
 
@@ -72,11 +90,11 @@ class Config:
         'hourly_pattern_daily', 'product_summary',
     }
 
-    DANGEROUS_KEYWORDS = {
+    DANGEROUS_KEYWORDS = frozenset({
         'DROP', 'DELETE', 'TRUNCATE', 'ALTER', 'CREATE',
         'INSERT', 'UPDATE', 'GRANT', 'REVOKE', 'EXECUTE',
         'PROCEDURE', 'FUNCTION'
-    }
+    })
 
     DB_URLS: dict[str, str | None] = {
         'financial_db': os.getenv('FINANCIAL_DB_URL'),
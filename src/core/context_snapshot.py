@@ -17,6 +17,7 @@ from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
 from src.core.baseline_cache import BaselineCache
+from src.utils.formatting import fmt_rev, fmt_trx
 
 # Channel code → human-readable name
 _CHANNEL_NAMES: dict[str, str] = {
@@ -600,19 +601,7 @@ def _get_dod_summary(conn, latest_date: str) -> dict:
     }
 
 
-# ── formatters ────────────────────────────────────────────────────────────────
+# ── formatters — shared scale logic lives in src.utils.formatting ─────────────
 
-def _fmt_trx(n: float) -> str:
-    if n >= 1_000_000:
-        return f"{n/1_000_000:.1f}jt"
-    if n >= 1_000:
-        return f"{n/1_000:.1f}rb"
-    return str(int(n))
-
-
-def _fmt_rev(n: float) -> str:
-    if n >= 1_000_000_000:
-        return f"{n/1_000_000_000:.1f} miliar"
-    if n >= 1_000_000:
-        return f"{n/1_000_000:.1f} juta"
-    return f"{int(n):,}"
+_fmt_trx = fmt_trx
+_fmt_rev = fmt_rev
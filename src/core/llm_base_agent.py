@@ -31,10 +31,9 @@ Example .env configuration:
 """
 
 import os
+import threading
 from typing import TYPE_CHECKING, Any
 
-from dotenv import load_dotenv
-
 if TYPE_CHECKING:
     from src.models.agent_state import AgentState
 
@@ -42,8 +41,6 @@ from src.core.base_agent import BaseAgent
 from src.core.config import Config
 from src.utils.exceptions import LLMCallError
 
-load_dotenv()
-
 # Default models per provider
 DEFAULT_MODELS = {
     "anthropic": "claude-sonnet-4-20250514",
@@ -53,6 +50,18 @@ DEFAULT_MODELS = {
     "openrouter": "google/gemini-2.5-flash",
 }
 
+# Fast/cheap models per provider, for agents whose task is light enough
+# (classification, structural planning, yes/no checks) that a small model
+# is sufficient. Resolved through _fast_model_for_provider(), which defers
+# to an explicit per-agent *_MODEL env override.
+FAST_MODELS = {
+    "anthropic":  "claude-haiku-4-5-20251001",
+    "openai":     "gpt-4o-mini",
+    "groq":       "llama3-8b-8192",
+    "gemini":     "gemini-1.5-flash",
+    "openrouter": "google/gemini-2.5-flash",
+}
+
 # Env key mapping per agent name
 AGENT_ENV_KEYS = {
     "query_rewriter":         ("QUERY_REWRITER_LLM",         "QUERY_REWRITER_MODEL"),
@@ -75,6 +84,12 @@ API_KEY_ENV = {
     "openrouter": "OPENROUTER_API_KEY",
 }
 
+# One SDK client per provider, shared by every agent in the process. Each
+# client owns an httpx connection pool, so sharing it amortizes TCP+TLS
+# handshakes and reuses keep-alive connections across the whole pipeline
+# instead of maintaining one idle pool per agent. Clients are thread-safe.
+_CLIENT_CACHE: dict[str, Any] = {}
+
 
 class LLMBaseAgent(BaseAgent):
     """
@@ -103,12 +118,24 @@ class LLMBaseAgent(BaseAgent):
             model_override=model,
         )
 
-        # Token usage from the most recent provider call — set by each _call_* method.
-        # Read immediately after _call_llm() returns; never rely on it after another call.
-        self._last_usage: dict | None = None
+        # Token usage from the most recent provider call on this thread — set
+        # by each _call_* method through the _last_usage property. Thread-local
+        # because agents are process-wide singletons serving concurrent
+        # requests: instance state here would let one request's token counts
+        # be attributed to another request's request_id.
+        self._usage_local = threading.local()
 
         self.log(f"LLM provider: {self.provider}, model: {self.model}")
 
+    @property
+    def _last_usage(self) -> dict | None:
+        """Usage dict from the most recent provider call on this thread."""
+        return getattr(self._usage_local, "usage", None)
+
+    @_last_usage.setter
+    def _last_usage(self, value: dict | None) -> None:
+        self._usage_local.usage = value
+
     def _init_client(self, agent_name: str, model_override: str | None = None) -> tuple[str, Any, str]:
         """
         Initialize LLM client based on .env configuration.
@@ -173,8 +200,28 @@ class LLMBaseAgent(BaseAgent):
         # Use provider default
         return DEFAULT_MODELS[provider]
 
+    def _fast_model_for_provider(self) -> str | None:
+        """
+        Fast/cheap model for this agent's provider, or None when the agent's
+        model was pinned via its *_MODEL env var (an explicit override always
+        wins over the automatic downgrade).
+        """
+        if self.name in AGENT_ENV_KEYS:
+            _, model_key = AGENT_ENV_KEYS[self.name]
+            if os.getenv(model_key):
+                return None
+        return FAST_MODELS.get(self.provider)
+
     def _create_client(self, provider: str) -> Any:
-        """Create LLM client for the given provider."""
+        """Return the shared LLM client for the given provider, creating it once."""
+        client = _CLIENT_CACHE.get(provider)
+        if client is None:
+            client = self._build_client(provider)
+            _CLIENT_CACHE[provider] = client
+        return client
+
+    def _build_client(self, provider: str) -> Any:
+        """Create a new LLM client for the given provider."""
         api_key = os.getenv(API_KEY_ENV[provider])
 
         if not api_key:
@@ -219,6 +266,7 @@ class LLMBaseAgent(BaseAgent):
         temperature: float = 0,
         use_thinking: bool = False,
         model: str | None = None,
+        system: str | None = None,
     ) -> str:
         """
         Call LLM API and return response text.
@@ -230,6 +278,9 @@ class LLMBaseAgent(BaseAgent):
             max_tokens: Maximum tokens in response
             temperature: Sampling temperature (0 = deterministic)
             use_thinking: Enable extended thinking (Anthropic only)
+            system: Optional static system prompt. On Anthropic it is sent as a
+                cache_control=ephemeral block so the provider caches the prefix
+                across calls; other providers receive it as a system message.
 
         Returns:
             Response text
@@ -239,13 +290,13 @@ class LLMBaseAgent(BaseAgent):
         """
         try:
             if self.provider == "anthropic":
-                return self._call_anthropic(prompt, max_tokens, temperature, use_thinking, model=model)
+                return self._call_anthropic(prompt, max_tokens, temperature, use_thinking, model=model, system=system)
             elif self.provider in ("openai", "openrouter"):
-                return self._call_openai(prompt, max_tokens, temperature, use_thinking, model=model)
+                return self._call_openai(prompt, max_tokens, temperature, use_thinking, model=model, system=system)
             elif self.provider in ("gemini",):
-                return self._call_openai(prompt, max_tokens, temperature, model=model)
+                return self._call_openai(prompt, max_tokens, temperature, model=model, system=system)
             elif self.provider == "groq":
-                return self._call_groq(prompt, max_tokens, temperature, model=model)
+                return self._call_groq(prompt, max_tokens, temperature, model=model, system=system)
             else:
                 raise LLMCallError(
                     agent_name=self.name,
@@ -268,6 +319,7 @@ class LLMBaseAgent(BaseAgent):
         temperature: float,
         use_thinking: bool = False,
         model: str | None = None,
+        system: str | None = None,
     ) -> str:
         """Call Anthropic Claude API, optionally with extended thinking."""
         # Thinking requires budget_tokens < max_tokens; no temperature allowed
@@ -276,6 +328,14 @@ class LLMBaseAgent(BaseAgent):
             "model":    model or self.model,
             "messages": [{"role": "user", "content": prompt}],
         }
+        if system:
+            # Static prefix marked for provider-side prompt caching — repeat
+            # calls read the cached prefix instead of re-prefilling it.
+            kwargs["system"] = [{
+                "type": "text",
+                "text": system,
+                "cache_control": {"type": "ephemeral"},
+            }]
         if use_thinking:
             kwargs["max_tokens"] = max(max_tokens, _THINKING_BUDGET + 4000)
             kwargs["thinking"]   = {"type": "enabled", "budget_tokens": _THINKING_BUDGET}
@@ -289,6 +349,9 @@ class LLMBaseAgent(BaseAgent):
                 "prompt_tokens":     response.usage.input_tokens,
                 "completion_tokens": response.usage.output_tokens,
                 "total_tokens":      response.usage.input_tokens + response.usage.output_tokens,
+                # Cache efficacy counters (0 when caching is not in play)
+                "cache_read_input_tokens":     getattr(response.usage, "cache_read_input_tokens", 0) or 0,
+                "cache_creation_input_tokens": getattr(response.usage, "cache_creation_input_tokens", 0) or 0,
             }
         # Response may contain thinking blocks + text blocks — return text only
         return next(
@@ -308,9 +371,13 @@ class LLMBaseAgent(BaseAgent):
         temperature: float,
         use_thinking: bool = False,
         model: str | None = None,
+        system: str | None = None,
     ) -> str:
         """Call OpenAI GPT API, optionally routing to a reasoning model."""
         effective_model = model or self.model
+        messages = [{"role": "user", "content": prompt}]
+        if system:
+            messages.insert(0, {"role": "system", "content": system})
         if use_thinking:
             # Switch to reasoning model for complex intents
             reasoning_model = "o4-mini"
@@ -318,7 +385,7 @@ class LLMBaseAgent(BaseAgent):
                 model=reasoning_model,
                 max_completion_tokens=max(max_tokens, 8000),
                 reasoning_effort="high",
-                messages=[{"role": "user", "content": prompt}],
+                messages=messages,
             )
             self.log(f"OpenAI reasoning model used: {reasoning_model}")
         elif self._is_openai_reasoning_model(effective_model):
@@ -326,14 +393,14 @@ class LLMBaseAgent(BaseAgent):
             response = self.client.chat.completions.create(
                 model=effective_model,
                 max_completion_tokens=max_tokens,
-                messages=[{"role": "user", "content": prompt}],
+                messages=messages,
             )
         else:
             response = self.client.chat.completions.create(
                 model=effective_model,
                 max_tokens=max_tokens,
                 temperature=temperature,
-                messages=[{"role": "user", "content": prompt}],
+                messages=messages,
             )
         if response.usage:
             self._last_usage = {
@@ -343,13 +410,23 @@ class LLMBaseAgent(BaseAgent):
             }
         return response.choices[0].message.content.strip()
 
-    def _call_groq(self, prompt: str, max_tokens: int, temperature: float, model: str | None = None) -> str:
+    def _call_groq(
+        self,
+        prompt: str,
+        max_tokens: int,
+        temperature: float,
+        model: str | None = None,
+        system: str | None = None,
+    ) -> str:
         """Call Groq API (same interface as OpenAI)."""
+        messages = [{"role": "user", "content": prompt}]
+        if system:
+            messages.insert(0, {"role": "system", "content": system})
         response = self.client.chat.completions.create(
             model=model or self.model,
             max_tokens=max_tokens,
             temperature=temperature,
-            messages=[{"role": "user", "content": prompt}]
+            messages=messages
         )
         if response.usage:
             self._last_usage = {
@@ -7,7 +7,6 @@ import uuid
 from contextlib import asynccontextmanager
 from typing import Any, Dict, List, Literal, Optional
 
-from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -16,8 +15,7 @@ from pydantic import BaseModel, field_validator
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
-
-load_dotenv()
+from starlette.concurrency import run_in_threadpool
 
 from src.agents.insight_generator import InsightGenerator
 from src.agents.intent_classifier import IntentClassifier
@@ -219,6 +217,10 @@ async def process_query(request: Request, body: QueryRequest) -> QueryResponse:
     Main endpoint: Run the complete 7-agent pipeline.
 
     Rate limited to RATE_LIMIT_PER_MINUTE requests per IP per minute.
+
+    The pipeline is synchronous (LLM + DB calls), so it runs in a worker
+    thread — concurrent requests overlap their network waits instead of
+    serializing behind a blocked event loop.
     """
     request_id = str(uuid.uuid4())
     state = AgentState(
@@ -231,7 +233,7 @@ async def process_query(request: Request, body: QueryRequest) -> QueryResponse:
     )
 
     try:
-        state = pipeline.run(state)
+        state = await run_in_threadpool(pipeline.run, state)
 
         total_ms = sum(state.timing.values()) * 1000
 
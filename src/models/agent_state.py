@@ -14,7 +14,7 @@ from datetime import date, datetime
 from typing import Any, Dict, List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class ExecutionStep:
     """One step in a multi-step analytical plan."""
 
@@ -24,7 +24,7 @@ class ExecutionStep:
     depends_on: list[int] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class StepResult:
     """Result of executing one step."""
 
@@ -36,7 +36,7 @@ class StepResult:
     summary: str  # short text summary injected into next-step context
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolCallResult:
     """Result from a single AnalyticsAgent tool call (detect_anomaly, compare_periods, etc.).
 
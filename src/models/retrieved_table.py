@@ -17,7 +17,7 @@ from dataclasses import dataclass, field
 from typing import List
 
 
-@dataclass
+@dataclass(slots=True)
 class RetrievedTable:
     """
     Represents a retrieved table schema from ChromaDB.
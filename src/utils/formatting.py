@@ -0,0 +1,36 @@
+"""
+Number Formatting — Indonesian business-scale rendering.
+
+Single source of truth for the jt/rb and juta/miliar scale logic used when
+rendering transaction counts and Rupiah amounts into LLM context blocks.
+The scale tables are precomputed at import, so each formatter is one short
+walk with no per-call allocations — and callers (context snapshot, baseline
+cache) can no longer drift apart on bucket boundaries.
+"""
+
+# (threshold, divisor, suffix) — walked top-down, first match wins
+_TRX_SCALE: tuple[tuple[float, float, str], ...] = (
+    (1_000_000, 1_000_000, "jt"),
+    (1_000,     1_000,     "rb"),
+)
+
+_REV_SCALE: tuple[tuple[float, float, str], ...] = (
+    (1_000_000_000, 1_000_000_000, " miliar"),
+    (1_000_000,     1_000_000,     " juta"),
+)
+
+
+def fmt_trx(n: float) -> str:
+    """Format a transaction count: '1.5jt', '5.0rb', '500'."""
+    for threshold, divisor, suffix in _TRX_SCALE:
+        if n >= threshold:
+            return f"{n / divisor:.1f}{suffix}"
+    return str(int(n))
+
+
+def fmt_rev(n: float) -> str:
+    """Format a Rupiah amount (no 'Rp' prefix): '1.2 miliar', '252.3 juta', '500,000'."""
+    for threshold, divisor, suffix in _REV_SCALE:
+        if n >= threshold:
+            return f"{n / divisor:.1f}{suffix}"
+    return f"{int(n):,}"
@@ -11,6 +11,8 @@ Tests cover:
 """
 
 import logging
+import threading
+from collections import OrderedDict
 from unittest.mock import MagicMock, call, patch
 
 import pytest
@@ -91,6 +93,14 @@ def _make_mock_retriever(mock_collection) -> SchemaRetriever:
     retriever.bm25 = None
     retriever.bm25_corpus = []
     retriever.graph = None
+    retriever._retrieve_cache = OrderedDict()
+    retriever._cache_lock = threading.Lock()
+    retriever.cache_hits = 0
+    retriever.cache_misses = 0
+    retriever.embedding_fn = None
+    retriever._sem_matrix = None
+    retriever._sem_values = []
+    retriever._sem_lock = threading.Lock()
     retriever.metrics = {
         "total_calls": 0, "successful_calls": 0, "failed_calls": 0,
         "total_time_seconds": 0.0, "average_time_seconds": 0.0,
@@ -221,6 +221,60 @@ class TestExtendedThinking:
         )
 
 
+# ========================================
+# Test: Prompt-keyed response cache
+# ========================================
+
+class TestResponseCache:
+
+    def test_identical_prompt_hits_cache(self, anthropic_generator, state_with_results):
+        """Re-running the same state must reuse the cached LLM output."""
+        with patch.object(anthropic_generator, "_call_llm", return_value="insight") as mock_llm:
+            anthropic_generator.run(state_with_results)
+            second = anthropic_generator.run(state_with_results)
+
+        assert mock_llm.call_count == 1
+        assert anthropic_generator.cache_hits == 1
+        assert second.insights == "insight"
+
+    def test_different_results_miss_cache(self, anthropic_generator, state_with_results):
+        """Changed query results change the prompt, so the cache must miss."""
+        with patch.object(anthropic_generator, "_call_llm", return_value="insight") as mock_llm:
+            anthropic_generator.run(state_with_results)
+            state_with_results.query_result = [{"total": 999}]
+            anthropic_generator.run(state_with_results)
+
+        assert mock_llm.call_count == 2
+        assert anthropic_generator.cache_hits == 0
+
+
+# ========================================
+# Test: Output-token budget follows response_length
+# ========================================
+
+class TestOutputBudget:
+
+    def test_brief_uses_small_max_tokens(self, anthropic_generator, state_with_results):
+        """A brief answer (1–2 sentences) must not reserve the detailed ceiling."""
+        state_with_results.layout_plan = {"response_length": "brief"}
+
+        with patch.object(anthropic_generator, "_call_llm", return_value="insight") as mock_llm:
+            anthropic_generator.run(state_with_results)
+
+        _, kwargs = mock_llm.call_args
+        assert kwargs.get("max_tokens") == 300
+
+    def test_standard_uses_default_max_tokens(self, anthropic_generator, state_with_results):
+        """No layout plan → standard budget."""
+        state_with_results.layout_plan = None
+
+        with patch.object(anthropic_generator, "_call_llm", return_value="insight") as mock_llm:
+            anthropic_generator.run(state_with_results)
+
+        _, kwargs = mock_llm.call_args
+        assert kwargs.get("max_tokens") == 1000
+
+
 # ========================================
 # Test: FIX #2 — monitoring guard year false positive
 # ========================================
@@ -127,6 +127,25 @@ class TestAmbiguousIntents:
         assert state.intent["category"] == "aggregation"
         assert state.needs_clarification is False
 
+    def test_fast_path_skips_llm_for_vague_query(self, classifier, ambiguous_state):
+        """Obviously vague queries must not pay an LLM round-trip."""
+        with patch.object(classifier, "_call_llm") as mock_llm:
+            state = classifier.run(ambiguous_state)
+
+        mock_llm.assert_not_called()
+        assert state.intent["category"] == "ambiguous"
+        assert state.needs_clarification is True
+
+    def test_fast_path_does_not_trigger_on_real_query(self, classifier, sample_state):
+        """Queries with content words go to the LLM as usual."""
+        mock_response = "INTENT: aggregation\nCONFIDENCE: 0.95\nREASON: Count query"
+
+        with patch.object(classifier, "_call_llm", return_value=mock_response) as mock_llm:
+            state = classifier.run(sample_state)
+
+        mock_llm.assert_called_once()
+        assert state.intent["category"] == "aggregation"
+
     def test_unknown_category_falls_back_to_ambiguous(self, classifier, sample_state):
         """Unknown intent category should fall back to ambiguous."""
         mock_response = "INTENT: unknown_category\nCONFIDENCE: 0.9\nREASON: Something"
@@ -138,6 +157,108 @@ class TestAmbiguousIntents:
         assert state.needs_clarification is True
 
 
+# ========================================
+# Test: Fast Model + Escalation
+# ========================================
+
+class TestModelEscalation:
+
+    def test_low_confidence_escalates_to_stronger_model(self, classifier, sample_state):
+        """Confidence below threshold on the fast model retries once on the configured model."""
+        classifier.model = "fast-model"
+        classifier._escalation_model = "strong-model"
+        responses = [
+            "INTENT: aggregation\nCONFIDENCE: 0.4\nREASON: Unsure",
+            "INTENT: aggregation\nCONFIDENCE: 0.95\nREASON: Count query",
+        ]
+
+        with patch.object(classifier, "_call_llm", side_effect=responses) as mock_llm:
+            state = classifier.run(sample_state)
+
+        assert mock_llm.call_count == 2
+        assert mock_llm.call_args.kwargs["model"] == "strong-model"
+        assert state.intent["category"] == "aggregation"
+        assert state.intent["confidence"] == 0.95
+        assert state.needs_clarification is False
+
+    def test_high_confidence_does_not_escalate(self, classifier, sample_state):
+        """A confident fast-model answer is accepted without a second call."""
+        classifier.model = "fast-model"
+        classifier._escalation_model = "strong-model"
+        mock_response = "INTENT: aggregation\nCONFIDENCE: 0.95\nREASON: Count query"
+
+        with patch.object(classifier, "_call_llm", return_value=mock_response) as mock_llm:
+            classifier.run(sample_state)
+
+        assert mock_llm.call_count == 1
+
+    def test_no_escalation_when_models_identical(self, classifier, sample_state):
+        """No retry when the fast model IS the configured model (env override)."""
+        classifier.model = "same-model"
+        classifier._escalation_model = "same-model"
+        mock_response = "INTENT: aggregation\nCONFIDENCE: 0.4\nREASON: Unsure"
+
+        with patch.object(classifier, "_call_llm", return_value=mock_response) as mock_llm:
+            classifier.run(sample_state)
+
+        assert mock_llm.call_count == 1
+
+
+# ========================================
+# Test: Exact-Match Response Cache
+# ========================================
+
+class TestResponseCache:
+
+    def test_identical_query_hits_cache(self, classifier, sample_state):
+        """Second run with the same prompt must not call the LLM again."""
+        mock_response = "INTENT: aggregation\nCONFIDENCE: 0.95\nREASON: Count query"
+
+        with patch.object(classifier, "_call_llm", return_value=mock_response) as mock_llm:
+            first = classifier.run(AgentState(query=sample_state.query, database="sales_db"))
+            second = classifier.run(AgentState(query=sample_state.query, database="sales_db"))
+
+        assert mock_llm.call_count == 1
+        assert classifier.cache_hits == 1
+        assert classifier.cache_misses == 1
+        assert second.intent["category"] == first.intent["category"]
+
+    def test_paraphrase_hits_cache(self, classifier):
+        """Reordered/punctuation-variant query shares the cache entry."""
+        mock_response = "INTENT: aggregation\nCONFIDENCE: 0.95\nREASON: Count query"
+
+        with patch.object(classifier, "_call_llm", return_value=mock_response) as mock_llm:
+            classifier.run(AgentState(query="Berapa jumlah customer?", database="sales_db"))
+            state = classifier.run(AgentState(query="jumlah customer berapa", database="sales_db"))
+
+        assert mock_llm.call_count == 1
+        assert classifier.cache_hits == 1
+        assert state.intent["category"] == "aggregation"
+
+    def test_different_query_misses_cache(self, classifier):
+        """Different query text must go back to the LLM."""
+        mock_response = "INTENT: aggregation\nCONFIDENCE: 0.95\nREASON: Count query"
+
+        with patch.object(classifier, "_call_llm", return_value=mock_response) as mock_llm:
+            classifier.run(AgentState(query="total revenue", database="sales_db"))
+            classifier.run(AgentState(query="total customers", database="sales_db"))
+
+        assert mock_llm.call_count == 2
+        assert classifier.cache_hits == 0
+
+    def test_failed_call_does_not_populate_cache(self, classifier, sample_state):
+        """An LLM failure must not leave a cache entry behind."""
+        from src.utils.exceptions import LLMCallError
+
+        with patch.object(
+            classifier, "_call_llm", side_effect=LLMCallError(agent_name="intent_classifier", message="boom")
+        ):
+            with pytest.raises(Exception):
+                classifier.execute(AgentState(query=sample_state.query, database="sales_db"))
+
+        assert len(classifier._response_cache) == 0
+
+
 # ========================================
 # Test: State Input/Output
 # ========================================
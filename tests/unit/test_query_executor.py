@@ -28,11 +28,12 @@ def mock_engine():
     result = MagicMock()
 
     result.keys.return_value = ["total"]
-    result.fetchmany.return_value = [{"total": 100}]
+    result.mappings.return_value.partitions.return_value = [[{"total": 100}]]
 
     conn.__enter__ = MagicMock(return_value=conn)
     conn.__exit__ = MagicMock(return_value=False)
     conn.execute.return_value = result
+    conn.execution_options.return_value = conn
 
     engine.connect.return_value = conn
     return engine
@@ -84,7 +85,7 @@ class TestSuccessfulExecution:
     def test_empty_result_returns_zero_rows(self, executor, mock_engine):
         """Empty query result should set row_count to 0."""
         conn = mock_engine.connect.return_value.__enter__.return_value
-        conn.execute.return_value.fetchmany.return_value = []
+        conn.execute.return_value.mappings.return_value.partitions.return_value = []
 
         state = make_state("SELECT * FROM customers WHERE 1=0;")
         result = executor.run(state)
@@ -148,14 +149,64 @@ class TestErrorHandling:
 
 class TestRowLimit:
 
-    def test_row_limit_enforced(self, executor, mock_engine):
-        """fetchmany should be called with max_rows limit."""
+    def test_row_limit_enforced(self, mock_engine):
+        """Streamed partitions should be truncated to max_rows."""
         conn = mock_engine.connect.return_value.__enter__.return_value
-        state = make_state("SELECT * FROM customers;")
+        conn.execute.return_value.mappings.return_value.partitions.return_value = [
+            [{"n": i} for i in range(5)],
+            [{"n": i} for i in range(5, 10)],
+        ]
 
-        executor.run(state)
+        with patch.object(QueryExecutor, "_create_engines", return_value={"sales_db": mock_engine}):
+            executor = QueryExecutor(timeout_seconds=30, max_rows=7)
+
+        result = executor.run(make_state("SELECT * FROM customers;"))
+
+        assert result.row_count == 7
+
+    def test_stops_fetching_partitions_once_limit_reached(self, mock_engine):
+        """Partitions past the row limit should never be consumed."""
+        conn = mock_engine.connect.return_value.__enter__.return_value
+
+        def partitions(size):
+            yield [{"n": i} for i in range(5)]
+            raise AssertionError("second partition should not be fetched")
+
+        conn.execute.return_value.mappings.return_value.partitions.side_effect = partitions
+
+        with patch.object(QueryExecutor, "_create_engines", return_value={"sales_db": mock_engine}):
+            executor = QueryExecutor(timeout_seconds=30, max_rows=5)
+
+        result = executor.run(make_state("SELECT * FROM customers;"))
+
+        assert result.row_count == 5
+
+
+# ========================================
+# Test: Statement Cache
+# ========================================
+
+class TestStatementCache:
+
+    def test_identical_sql_reuses_text_clause(self, executor):
+        """Running the same SQL twice should reuse the memoized TextClause."""
+        sql = "SELECT COUNT(*) as total FROM customers;"
+
+        executor.run(make_state(sql))
+        first = executor._text_cache[sql]
+        executor.run(make_state(sql))
+
+        assert executor._text_cache[sql] is first
+
+    def test_cache_evicts_oldest_entry(self, executor):
+        """The TextClause cache should stay bounded (LRU eviction)."""
+        from src.agents.query_executor import _TEXT_CACHE_MAX_ENTRIES
+
+        for i in range(_TEXT_CACHE_MAX_ENTRIES + 1):
+            executor.run(make_state(f"SELECT {i} as n;"))
 
-        conn.execute.return_value.fetchmany.assert_called_with(executor.max_rows)
+        assert len(executor._text_cache) == _TEXT_CACHE_MAX_ENTRIES
+        assert "SELECT 0 as n;" not in executor._text_cache
 
 
 # ========================================
@@ -210,7 +261,7 @@ class TestCheckConnectivity:
     def test_returns_error_string_when_db_unreachable(self, executor, mock_engine):
         """check_connectivity should return 'error: ...' when SELECT 1 fails."""
         conn = mock_engine.connect.return_value.__enter__.return_value
-        conn.execute.side_effect = Exception("connection refused")
+        conn.exec_driver_sql.side_effect = Exception("connection refused")
 
         status = executor.check_connectivity()
 
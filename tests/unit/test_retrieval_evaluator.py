@@ -80,6 +80,45 @@ class TestSkipEvaluation:
             mock_llm.assert_called_once()
 
 
+# ========================================
+# Test: Prompt Split
+# ========================================
+
+class TestPromptSplit:
+
+    def test_static_rubric_sent_as_system_prompt(self, evaluator, sample_tables):
+        """Categories and JSON format live in the (cacheable) system prompt."""
+        state = make_state_with_tables(sample_tables)
+        mock_response = _json_response([
+            {"name": "financial_db.daily_master", "category": "ESSENTIAL", "reason": "Required"},
+            {"name": "financial_db.financial_internal", "category": "EXCLUDED", "reason": "Not needed"},
+            {"name": "financial_db.product_summary", "category": "EXCLUDED", "reason": "Not needed"},
+        ])
+
+        with patch.object(evaluator, "_call_llm", return_value=mock_response) as mock_llm:
+            evaluator.run(state)
+
+        system = mock_llm.call_args.kwargs["system"]
+        prompt = mock_llm.call_args.args[0]
+        assert "ESSENTIAL" in system
+        assert state.query in prompt
+        assert "ESSENTIAL: directly required" not in prompt
+
+    def test_max_tokens_scales_with_table_count(self, evaluator, sample_tables):
+        """Response budget should be bounded by the number of tables, not flat 1000."""
+        state = make_state_with_tables(sample_tables)
+        mock_response = _json_response([
+            {"name": "financial_db.daily_master", "category": "ESSENTIAL", "reason": "Required"},
+            {"name": "financial_db.financial_internal", "category": "EXCLUDED", "reason": "Not needed"},
+            {"name": "financial_db.product_summary", "category": "EXCLUDED", "reason": "Not needed"},
+        ])
+
+        with patch.object(evaluator, "_call_llm", return_value=mock_response) as mock_llm:
+            evaluator.run(state)
+
+        assert mock_llm.call_args.kwargs["max_tokens"] < 1000
+
+
 # ========================================
 # Test: Classification
 # ========================================
@@ -269,6 +308,114 @@ class TestDatabaseFilter:
         assert len(result.evaluated_tables) == len(sample_tables)
 
 
+# ========================================
+# Test: Score Short-Circuit
+# ========================================
+
+def _table(name: str, score: float) -> RetrievedTable:
+    """Helper to build a financial_db table with a given similarity score."""
+    return RetrievedTable(
+        db_name="financial_db",
+        table_name=name,
+        columns=["id"],
+        description=f"{name} table",
+        similarity_score=score,
+    )
+
+
+class TestScoreShortCircuit:
+    """Scores mirror what the retriever actually emits: RRF-fused values
+    bounded by 3/(RRF_K+1) ≈ 0.049 with RRF_K=60 — never cosine [0,1]."""
+
+    def test_dominant_top_table_skips_llm(self, evaluator):
+        """Rank-1 in all three retrievers with a distant runner-up skips the LLM."""
+        tables = [
+            _table("daily_master", 3 / 61),       # rank 1 in chroma+bm25+graph
+            _table("anomalies", 1 / 63),          # rank 3 in one list
+            _table("product_summary", 1 / 65),    # rank 5 in one list
+        ]
+        state = make_state_with_tables(tables)
+
+        with patch.object(evaluator, "_call_llm") as mock_llm:
+            result = evaluator.run(state)
+            mock_llm.assert_not_called()
+
+        assert [t.table_name for t in result.evaluated_tables] == ["daily_master"]
+
+    def test_clustered_scores_keep_all_without_llm(self, evaluator):
+        """Adjacent single-list ranks cluster within the epsilon — keep all, no LLM."""
+        tables = [
+            _table("daily_master", 1 / 61),
+            _table("anomalies", 1 / 62),
+            _table("product_summary", 1 / 63),
+        ]
+        state = make_state_with_tables(tables)
+
+        with patch.object(evaluator, "_call_llm") as mock_llm:
+            result = evaluator.run(state)
+            mock_llm.assert_not_called()
+
+        assert len(result.evaluated_tables) == 3
+
+    def test_ambiguous_scores_still_call_llm(self, evaluator):
+        """A two-list top without a dominant lead must go to the LLM."""
+        tables = [
+            _table("daily_master", 1 / 61 + 1 / 62),  # rank 1 in two lists only
+            _table("anomalies", 1 / 62),
+            _table("product_summary", 1 / 63),
+        ]
+        state = make_state_with_tables(tables)
+        mock_response = _json_response([
+            {"name": "financial_db.daily_master", "category": "ESSENTIAL", "reason": "Required"},
+            {"name": "financial_db.anomalies", "category": "EXCLUDED", "reason": "Not needed"},
+            {"name": "financial_db.product_summary", "category": "EXCLUDED", "reason": "Not needed"},
+        ])
+
+        with patch.object(evaluator, "_call_llm", return_value=mock_response) as mock_llm:
+            evaluator.run(state)
+            mock_llm.assert_called_once()
+
+
+# ========================================
+# Test: Response Cache
+# ========================================
+
+class TestResponseCache:
+
+    def test_identical_query_and_tables_hit_cache(self, evaluator, sample_tables):
+        """Second evaluation of the same query + table set should skip the LLM."""
+        mock_response = _json_response([
+            {"name": "financial_db.daily_master", "category": "ESSENTIAL", "reason": "Required"},
+            {"name": "financial_db.financial_internal", "category": "EXCLUDED", "reason": "Not needed"},
+            {"name": "financial_db.product_summary", "category": "EXCLUDED", "reason": "Not needed"},
+        ])
+
+        with patch.object(evaluator, "_call_llm", return_value=mock_response) as mock_llm:
+            first = evaluator.run(make_state_with_tables(list(sample_tables)))
+            second = evaluator.run(make_state_with_tables(list(sample_tables)))
+            mock_llm.assert_called_once()
+
+        assert evaluator.cache_hits == 1
+        assert [t.table_name for t in first.evaluated_tables] == \
+            [t.table_name for t in second.evaluated_tables]
+
+    def test_different_query_misses_cache(self, evaluator, sample_tables):
+        """A different query over the same tables should call the LLM again."""
+        mock_response = _json_response([
+            {"name": "financial_db.daily_master", "category": "ESSENTIAL", "reason": "Required"},
+            {"name": "financial_db.financial_internal", "category": "EXCLUDED", "reason": "Not needed"},
+            {"name": "financial_db.product_summary", "category": "EXCLUDED", "reason": "Not needed"},
+        ])
+
+        with patch.object(evaluator, "_call_llm", return_value=mock_response) as mock_llm:
+            evaluator.run(make_state_with_tables(list(sample_tables)))
+            evaluator.run(make_state_with_tables(list(sample_tables), query="top 5 partner by revenue"))
+
+            assert mock_llm.call_count == 2
+
+        assert evaluator.cache_misses == 2
+
+
 # ========================================
 # Test: State Input/Output
 # ========================================
@@ -9,6 +9,7 @@ Tests cover:
 - State input/output correctness
 """
 
+import threading
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -51,8 +52,8 @@ def mock_collection():
 @pytest.fixture
 def retriever(mock_collection):
     """Initialize SchemaRetriever with mocked ChromaDB."""
-    with patch("src.agents.schema_retriever.chromadb.PersistentClient"):
-        with patch("src.agents.schema_retriever.embedding_functions.OpenAIEmbeddingFunction"):
+    with patch("chromadb.PersistentClient"):
+        with patch("chromadb.utils.embedding_functions.OpenAIEmbeddingFunction"):
             with patch.object(SchemaRetriever, "__init__", lambda self, *args, **kwargs: None):
                 retriever = SchemaRetriever.__new__(SchemaRetriever)
                 retriever.name = "schema_retriever"
@@ -62,6 +63,15 @@ def retriever(mock_collection):
                 retriever.bm25 = None
                 retriever.bm25_corpus = []
                 retriever.graph = None
+                from collections import OrderedDict
+                retriever._retrieve_cache = OrderedDict()
+                retriever._cache_lock = threading.Lock()
+                retriever.cache_hits = 0
+                retriever.cache_misses = 0
+                retriever.embedding_fn = None
+                retriever._sem_matrix = None
+                retriever._sem_values = []
+                retriever._sem_lock = threading.Lock()
                 retriever.metrics = {
                     "total_calls": 0,
                     "successful_calls": 0,
@@ -443,6 +453,15 @@ class TestRecallMode:
             r.bm25      = None
             r.bm25_corpus = []
             r.graph     = None
+            from collections import OrderedDict
+            r._retrieve_cache = OrderedDict()
+            r._cache_lock = threading.Lock()
+            r.cache_hits = 0
+            r.cache_misses = 0
+            r.embedding_fn = None
+            r._sem_matrix = None
+            r._sem_values = []
+            r._sem_lock = threading.Lock()
             r.metrics   = {
                 "total_calls": 0, "successful_calls": 0, "failed_calls": 0,
                 "total_time_seconds": 0.0, "average_time_seconds": 0.0,
@@ -486,3 +505,186 @@ class TestRecallMode:
         state.intent = None
         result = retriever_with_many_tables.execute(state)
         assert len(result.retrieved_tables) == 5
+
+
+# ========================================
+# Test: Retrieval Cache
+# ========================================
+
+class TestRetrievalCache:
+
+    def test_identical_query_hits_cache(self, retriever, mock_collection):
+        """A repeated identical query should not re-query ChromaDB."""
+        retriever.execute(AgentState(query="berapa total customer?", database="sales_db"))
+        retriever.execute(AgentState(query="berapa total customer?", database="sales_db"))
+
+        assert mock_collection.query.call_count == 1
+        assert retriever.cache_hits == 1
+
+    def test_cached_result_matches_original(self, retriever):
+        """Cache hit should return the same tables as the original retrieval."""
+        first = retriever.execute(AgentState(query="berapa total customer?", database="sales_db"))
+        second = retriever.execute(AgentState(query="Berapa Total Customer?", database="sales_db"))
+
+        assert [t.full_name for t in first.retrieved_tables] == \
+            [t.full_name for t in second.retrieved_tables]
+
+    def test_different_query_misses_cache(self, retriever, mock_collection):
+        """A different query must go through the full retrieval path."""
+        retriever.execute(AgentState(query="berapa total customer?", database="sales_db"))
+        retriever.execute(AgentState(query="top 5 order terbesar", database="sales_db"))
+
+        assert mock_collection.query.call_count == 2
+        assert retriever.cache_misses == 2
+
+    def test_cache_stats_reports_counters(self, retriever):
+        """cache_stats should expose hits, misses, and entry count."""
+        retriever.execute(AgentState(query="berapa total customer?", database="sales_db"))
+        retriever.execute(AgentState(query="berapa total customer?", database="sales_db"))
+
+        stats = retriever.cache_stats()
+        assert stats == {"hits": 1, "misses": 1, "entries": 1}
+
+
+# ========================================
+# Test: Semantic Cache
+# ========================================
+
+class TestSemanticCache:
+
+    @pytest.fixture
+    def retriever_with_embeddings(self, retriever):
+        """Give the retriever a deterministic embedding function."""
+        retriever.embedding_fn = MagicMock(return_value=[[0.6, 0.8, 0.0]])
+        return retriever
+
+    def test_paraphrase_hits_semantic_cache(self, retriever_with_embeddings, mock_collection):
+        """Near-identical embeddings should reuse the cached ChromaDB result."""
+        r = retriever_with_embeddings
+        r.execute(AgentState(query="berapa total customer?", database="sales_db"))
+        r.execute(AgentState(query="jumlah customer berapa?", database="sales_db"))
+
+        assert mock_collection.query.call_count == 1
+        assert r._sem_matrix is not None and len(r._sem_values) == 1
+
+    def test_dissimilar_embedding_misses_semantic_cache(self, retriever_with_embeddings, mock_collection):
+        """An orthogonal embedding must fall through to ChromaDB."""
+        r = retriever_with_embeddings
+        r.embedding_fn.side_effect = [[[0.6, 0.8, 0.0]], [[0.0, 0.0, 1.0]]]
+
+        r.execute(AgentState(query="berapa total customer?", database="sales_db"))
+        r.execute(AgentState(query="lihat daftar order", database="sales_db"))
+
+        assert mock_collection.query.call_count == 2
+
+    def test_query_reuses_precomputed_embedding(self, retriever_with_embeddings, mock_collection):
+        """ChromaDB should be queried with query_embeddings, not query_texts."""
+        retriever_with_embeddings.execute(
+            AgentState(query="berapa total customer?", database="sales_db")
+        )
+
+        call_kwargs = mock_collection.query.call_args[1]
+        assert "query_embeddings" in call_kwargs
+
+    def test_snapshot_roundtrip_restores_cache(self, retriever_with_embeddings, monkeypatch, tmp_path):
+        """A saved snapshot should warm a cold cache back to the same entries."""
+        from src.core.config import Config
+
+        r = retriever_with_embeddings
+        monkeypatch.setattr(Config, "SEMANTIC_CACHE_FILE", str(tmp_path / "semantic_cache.pkl"))
+
+        r.execute(AgentState(query="berapa total customer?", database="sales_db"))
+        r._save_semantic_cache()
+
+        r._sem_matrix, r._sem_values = None, []
+        r._load_semantic_cache()
+
+        assert r._sem_matrix is not None
+        assert len(r._sem_values) == 1
+
+    def test_expired_snapshot_is_ignored(self, retriever, monkeypatch, tmp_path):
+        """Snapshots older than the TTL should leave the cache cold."""
+        import os as _os
+
+        from src.core.config import Config
+
+        path = tmp_path / "semantic_cache.pkl"
+        monkeypatch.setattr(Config, "SEMANTIC_CACHE_FILE", str(path))
+        path.write_bytes(b"stale")
+        old = 1_000_000.0
+        _os.utime(path, (old, old))
+
+        retriever._load_semantic_cache()
+
+        assert retriever._sem_matrix is None
+        assert retriever._sem_values == []
+
+    def test_concurrent_stores_stay_index_aligned(self, retriever):
+        """Parallel stores must never desync the matrix from the values list —
+        a misaligned hit would silently return another query's tables."""
+        import numpy as np
+
+        n = 32
+
+        def store(i: int) -> None:
+            vec = np.zeros(n)
+            vec[i] = 1.0
+            retriever._semantic_store(vec, [{"table_name": f"t{i}"}])
+
+        threads = [threading.Thread(target=store, args=(i,)) for i in range(n)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert retriever._sem_matrix.shape[0] == len(retriever._sem_values) == n
+        for i in range(n):
+            vec = np.zeros(n)
+            vec[i] = 1.0
+            assert retriever._semantic_lookup(vec) == [{"table_name": f"t{i}"}]
+
+    def test_embedding_failure_falls_back_to_query_texts(self, retriever, mock_collection):
+        """If embedding fails, retrieval still works via Chroma's own embedding."""
+        retriever.embedding_fn = MagicMock(side_effect=RuntimeError("api down"))
+
+        result = retriever.execute(AgentState(query="berapa total customer?", database="sales_db"))
+
+        assert len(result.retrieved_tables) > 0
+        assert "query_texts" in mock_collection.query.call_args[1]
+
+
+# ========================================
+# Test: Batch Retrieval
+# ========================================
+
+class TestBatchRetrieval:
+
+    def test_batch_issues_single_chromadb_call(self, retriever, mock_collection):
+        """retrieve_batch should query ChromaDB once for all queries."""
+        mock_collection.query.return_value = {
+            "ids": [["sales_db.customers"], ["sales_db.orders"]],
+            "distances": [[0.05], [0.10]],
+            "metadatas": [
+                [{"db_name": "sales_db", "table_name": "customers",
+                  "columns": "customer_id", "description": "Customers", "relationships": ""}],
+                [{"db_name": "sales_db", "table_name": "orders",
+                  "columns": "order_id", "description": "Orders", "relationships": ""}],
+            ],
+        }
+
+        results = retriever.retrieve_batch(["berapa customer?", "berapa order?"])
+
+        assert mock_collection.query.call_count == 1
+        assert len(results) == 2
+        assert results[0][0].table_name == "customers"
+        assert results[1][0].table_name == "orders"
+
+    def test_batch_empty_queries_returns_empty(self, retriever, mock_collection):
+        """Empty input should not touch ChromaDB."""
+        assert retriever.retrieve_batch([]) == []
+        mock_collection.query.assert_not_called()
+
+    def test_batch_without_collection_returns_empty_lists(self, retriever):
+        """Degraded retriever (no ChromaDB) returns one empty list per query."""
+        retriever.collection = None
+        assert retriever.retrieve_batch(["a", "b"]) == [[], []]
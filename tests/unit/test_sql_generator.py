@@ -125,6 +125,26 @@ class TestIntentStrategy:
 
         assert "daily_master" in prompt
 
+    def test_static_rules_sent_as_system_prompt(self, generator, state_with_tables):
+        """Static rules + examples should go through the cacheable system channel."""
+        mock_sql = "SELECT COUNT(*) FROM customers LIMIT 100;"
+
+        with patch.object(generator, "_call_llm", return_value=mock_sql) as mock_llm:
+            generator.run(state_with_tables)
+            system = mock_llm.call_args.kwargs["system"]
+            prompt = mock_llm.call_args[0][0]
+
+        assert "STRICT RULES" in system
+        assert "EXAMPLE QUERIES" in system
+        assert state_with_tables.query in prompt
+
+    def test_schema_context_memoized_per_table_set(self, generator, state_with_tables):
+        """The same evaluated tables should reuse the built schema context."""
+        first = generator._schema_context(state_with_tables.evaluated_tables)
+        second = generator._schema_context(state_with_tables.evaluated_tables)
+
+        assert second is first
+
 
 # ========================================
 # Test: Error Handling
@@ -148,7 +168,7 @@ class TestExamplesLoading:
         """Should use domain-specific defaults when YAML is malformed."""
         import yaml as _yaml
         with patch.object(SQLGenerator, "_init_client", return_value=("openai", MagicMock(), "gpt-4o")):
-            with patch("builtins.open"), patch("yaml.safe_load", side_effect=_yaml.YAMLError("bad yaml")):
+            with patch("builtins.open"), patch("yaml.load", side_effect=_yaml.YAMLError("bad yaml")):
                 gen = SQLGenerator()
 
         assert len(gen.examples) > 0
@@ -149,6 +149,22 @@ class TestTableWhitelist:
             result = validator.run(state)
             assert result.validated_sql is not None
 
+    def test_multiple_ctes_pass(self, validator):
+        """Every CTE name should be recognized, not just the first one."""
+        sql = """WITH base AS (SELECT partner, total_trx FROM daily_master),
+top5 AS (SELECT * FROM base ORDER BY total_trx DESC LIMIT 5)
+SELECT * FROM top5;"""
+        state = make_state(sql)
+        result = validator.run(state)
+        assert result.validated_sql is not None
+
+    def test_subquery_alias_not_flagged(self, validator):
+        """Derived-table subqueries should not trip the whitelist."""
+        sql = "SELECT * FROM (SELECT partner FROM daily_master) sub LIMIT 10;"
+        state = make_state(sql)
+        result = validator.run(state)
+        assert result.validated_sql is not None
+
 
 # ========================================
 # Test: Auto-fix with AI
@@ -179,6 +195,197 @@ class TestAutoFix:
                 validator_with_ai.run(state)
 
 
+# ========================================
+# Test: Structural Validation Cache
+# ========================================
+
+class TestStructuralCache:
+
+    def test_repeat_validation_hits_cache(self, validator):
+        """Identical SQL should reuse the cached deterministic verdict."""
+        sql = "SELECT * FROM daily_master LIMIT 10;"
+
+        validator.run(make_state(sql))
+        validator.run(make_state(sql))
+
+        assert validator._structural_cached.cache_info().hits >= 1
+
+    def test_whitespace_variants_share_entry(self, validator):
+        """Formatting-only differences should collide on the same cache key."""
+        validator.run(make_state("SELECT *  FROM daily_master\nLIMIT 10;"))
+        validator.run(make_state("SELECT * FROM daily_master LIMIT 10;"))
+
+        assert validator._structural_cached.cache_info().currsize == 1
+
+    def test_cached_errors_still_raise(self, validator):
+        """A cached failing verdict must keep raising on re-validation."""
+        state = make_state("SELECT * FROM unknown_table;")
+        with pytest.raises(SQLValidationError):
+            validator.run(state)
+        with pytest.raises(SQLValidationError):
+            validator.run(make_state("SELECT * FROM unknown_table;"))
+
+
+# ========================================
+# Test: AI Validation Cache
+# ========================================
+
+class TestAIValidationCache:
+
+    _LLM_RESPONSE = "VALID: YES\nERRORS: None\nWARNINGS: None"
+    # Join queries are past the rule-based skip, so they reach the LLM layer.
+    _JOIN_SQL = "SELECT * FROM daily_master d JOIN anomalies a ON d.periode = a.periode;"
+
+    def test_repeat_validation_skips_llm(self, validator_with_ai):
+        """Identical (sql, query) pairs should reuse the cached AI verdict."""
+        with patch.object(validator_with_ai, "_call_llm", return_value=self._LLM_RESPONSE) as mock_llm:
+            validator_with_ai._validate_logic_ai(self._JOIN_SQL, "show data")
+            validator_with_ai._validate_logic_ai(self._JOIN_SQL, "show data")
+
+        mock_llm.assert_called_once()
+
+    def test_whitespace_variant_hits_cache(self, validator_with_ai):
+        """Cosmetic whitespace differences should collide on the same key."""
+        with patch.object(validator_with_ai, "_call_llm", return_value=self._LLM_RESPONSE) as mock_llm:
+            validator_with_ai._validate_logic_ai(self._JOIN_SQL, "show data")
+            validator_with_ai._validate_logic_ai(self._JOIN_SQL.lower().replace(" ", "  "), "show data")
+
+        mock_llm.assert_called_once()
+
+    def test_different_query_misses_cache(self, validator_with_ai):
+        """A different user question must trigger a fresh AI call."""
+        with patch.object(validator_with_ai, "_call_llm", return_value=self._LLM_RESPONSE) as mock_llm:
+            validator_with_ai._validate_logic_ai(self._JOIN_SQL, "show data")
+            validator_with_ai._validate_logic_ai(self._JOIN_SQL, "total revenue")
+
+        assert mock_llm.call_count == 2
+
+    def test_llm_failure_is_not_cached(self, validator_with_ai):
+        """Transient API failures must stay retryable."""
+        with patch.object(validator_with_ai, "_call_llm", side_effect=RuntimeError("api down")) as mock_llm:
+            validator_with_ai._validate_logic_ai(self._JOIN_SQL, "show data")
+            validator_with_ai._validate_logic_ai(self._JOIN_SQL, "show data")
+
+        assert mock_llm.call_count == 2
+
+
+# ========================================
+# Test: Rule-based AI Skip
+# ========================================
+
+class TestRuleBasedSkip:
+
+    def test_trivial_single_table_skips_llm(self, validator_with_ai):
+        """Single-table aggregate with no joins/subqueries never hits the LLM."""
+        with patch.object(validator_with_ai, "_call_llm") as mock_llm:
+            errors, warnings = validator_with_ai._validate_logic_ai(
+                "SELECT COUNT(*), SUM(total_trx) FROM daily_master;", "berapa total trx?"
+            )
+
+        mock_llm.assert_not_called()
+        assert errors == []
+        assert warnings == []
+
+    def test_join_query_reaches_llm(self, validator_with_ai):
+        """Joins are not provably safe — they must still be AI-checked."""
+        sql = "SELECT * FROM daily_master d JOIN anomalies a ON d.periode = a.periode;"
+        with patch.object(
+            validator_with_ai, "_call_llm", return_value="VALID: YES\nERRORS: None\nWARNINGS: None"
+        ) as mock_llm:
+            validator_with_ai._validate_logic_ai(sql, "show anomalies")
+
+        mock_llm.assert_called_once()
+
+    def test_comma_join_reaches_llm(self, validator_with_ai):
+        """Implicit comma joins touch two tables — not provably safe."""
+        sql = "SELECT * FROM daily_master, anomalies;"
+        with patch.object(
+            validator_with_ai, "_call_llm", return_value="VALID: YES\nERRORS: None\nWARNINGS: None"
+        ) as mock_llm:
+            validator_with_ai._validate_logic_ai(sql, "show data")
+
+        mock_llm.assert_called_once()
+
+    def test_subquery_reaches_llm(self, validator_with_ai):
+        """Nested SELECTs disqualify the rule-based skip."""
+        sql = "SELECT * FROM daily_master WHERE partner IN (SELECT partner FROM anomalies);"
+        with patch.object(
+            validator_with_ai, "_call_llm", return_value="VALID: YES\nERRORS: None\nWARNINGS: None"
+        ) as mock_llm:
+            validator_with_ai._validate_logic_ai(sql, "show data")
+
+        mock_llm.assert_called_once()
+
+
+# ========================================
+# Test: Auto-fix Cache
+# ========================================
+
+class TestAutoFixCache:
+
+    _ARGS = ("SELECT * FROM unknown_table;", ["TABLE: Unknown table 'unknown_table'"], "show data")
+
+    def test_repeat_fix_skips_llm(self, validator_with_ai):
+        """Identical (sql, errors, query) triples reuse the cached fix."""
+        with patch.object(validator_with_ai, "_call_llm", return_value="SELECT 1;") as mock_llm:
+            first = validator_with_ai._auto_fix(*self._ARGS)
+            second = validator_with_ai._auto_fix(*self._ARGS)
+
+        mock_llm.assert_called_once()
+        assert first == second == "SELECT 1;"
+
+    def test_expired_entry_refetches(self, validator_with_ai):
+        """Entries past the TTL must not be served."""
+        with patch.object(validator_with_ai, "_call_llm", return_value="SELECT 1;") as mock_llm:
+            validator_with_ai._auto_fix(*self._ARGS)
+            key, (fixed, ts) = next(iter(validator_with_ai._fix_cache.items()))
+            validator_with_ai._fix_cache[key] = (fixed, ts - 301)
+            validator_with_ai._auto_fix(*self._ARGS)
+
+        assert mock_llm.call_count == 2
+
+    def test_failed_fix_is_not_cached(self, validator_with_ai):
+        """Transient API failures must stay retryable."""
+        with patch.object(validator_with_ai, "_call_llm", side_effect=RuntimeError("api down")) as mock_llm:
+            validator_with_ai._auto_fix(*self._ARGS)
+            validator_with_ai._auto_fix(*self._ARGS)
+
+        assert mock_llm.call_count == 2
+        assert not validator_with_ai._fix_cache
+
+
+# ========================================
+# Test: Prompt Caching
+# ========================================
+
+class TestPromptCaching:
+
+    def test_logic_rubric_sent_as_system_prompt(self, validator_with_ai):
+        """The static validation rubric rides the cacheable system slot."""
+        from src.agents.sql_validator import _LOGIC_SYSTEM_PROMPT
+
+        sql = "SELECT * FROM daily_master d JOIN anomalies a ON d.periode = a.periode;"
+        with patch.object(
+            validator_with_ai, "_call_llm", return_value="VALID: YES\nERRORS: None\nWARNINGS: None"
+        ) as mock_llm:
+            validator_with_ai._validate_logic_ai(sql, "show anomalies")
+
+        assert mock_llm.call_args.kwargs["system"] == _LOGIC_SYSTEM_PROMPT
+        assert "You are a SQL validator" not in mock_llm.call_args.args[0]
+
+    def test_auto_fix_rubric_sent_as_system_prompt(self, validator_with_ai):
+        """The static fixer rubric rides the cacheable system slot."""
+        from src.agents.sql_validator import _AUTO_FIX_SYSTEM_PROMPT
+
+        with patch.object(validator_with_ai, "_call_llm", return_value="SELECT 1;") as mock_llm:
+            validator_with_ai._auto_fix(
+                "SELECT * FROM unknown_table;", ["TABLE: Unknown table 'unknown_table'"], "show data"
+            )
+
+        assert mock_llm.call_args.kwargs["system"] == _AUTO_FIX_SYSTEM_PROMPT
+        assert "You are a SQL fixer" not in mock_llm.call_args.args[0]
+
+
 # ========================================
 # Test: State Input/Output
 # ========================================
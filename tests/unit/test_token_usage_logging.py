@@ -8,6 +8,7 @@ Covers:
 - session_id / request_id / quality_tier flow from AgentState to log_token_usage
 """
 
+import threading
 from unittest.mock import MagicMock, call, patch
 
 import pytest
@@ -36,6 +37,20 @@ def _make_agent() -> IntentClassifier:
     return IntentClassifier()
 
 
+# ─────────────────────────────────────────────────────────────
+# Shared provider client
+# ─────────────────────────────────────────────────────────────
+
+class TestSharedClient:
+
+    def test_same_provider_shares_one_client(self):
+        """Two agents on the same provider reuse one SDK client (one HTTP pool)."""
+        a = _make_agent()
+        b = _make_agent()
+        assert a.provider == b.provider
+        assert a.client is b.client
+
+
 # ─────────────────────────────────────────────────────────────
 # _last_usage set by _call_openai
 # ─────────────────────────────────────────────────────────────
@@ -72,6 +87,33 @@ class TestLastUsageSetByProvider:
         assert agent._last_usage is None
 
 
+# ─────────────────────────────────────────────────────────────
+# _last_usage thread isolation
+# ─────────────────────────────────────────────────────────────
+
+class TestLastUsageThreadLocal:
+
+    def test_usage_is_isolated_per_thread(self):
+        """Concurrent requests through one singleton agent must never read
+        each other's usage — the attribution bug this guards against is one
+        request's tokens logged under another request's request_id."""
+        agent = _make_agent()
+        agent._last_usage = {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+
+        seen: dict = {}
+
+        def worker() -> None:
+            seen["initial"] = agent._last_usage
+            agent._last_usage = {"prompt_tokens": 99, "completion_tokens": 9, "total_tokens": 108}
+
+        t = threading.Thread(target=worker)
+        t.start()
+        t.join()
+
+        assert seen["initial"] is None
+        assert agent._last_usage["total_tokens"] == 2
+
+
 # ─────────────────────────────────────────────────────────────
 # _record_token_usage
 # ─────────────────────────────────────────────────────────────
@@ -187,15 +229,9 @@ class TestIntentClassifierLogsUsage:
         agent = _make_agent()
         state = _state()
 
-        _mock_intent = {
-            "category": "simple_select",
-            "segment": "general",
-            "confidence": 0.9,
-            "needs_clarification": False,
-            "clarification_reason": None,
-        }
+        mock_response = "INTENT: simple_select\nSEGMENT: general\nCONFIDENCE: 0.9\nREASON: ok"
 
-        with patch.object(agent, "_call_llm", return_value='{"category":"simple_select","segment":"general","confidence":0.9,"needs_clarification":false,"clarification_reason":null}'):
+        with patch.object(agent, "_call_llm", return_value=mock_response):
             with patch.object(agent, "_record_token_usage") as mock_record:
                 agent.execute(state)
                 mock_record.assert_called_once()